@@ -1,31 +1,53 @@
 import streamlit as st
-import torch
+import pandas as pd
+import numpy as np
 
-@st.cache_resource
-def load_model():
-    try:
-        return torch.load("path/to/model.pt")
-    except Exception as e:
-        st.error(f"Failed to load model: {e}")
-        return None
+from utils.qa_model import FAILED, READY, ask_model, get_model_loader
+from utils.registry import page_path
 
-model = load_model()
+# Start loading the Q&A model in the background; nothing below waits for it
+model_loader = get_model_loader()
+model_loader.check_for_update()
+# Filled in last, so waiting on an answer never holds up the rest of the page
+qa_box = st.container()
 
-if model is None:
-    st.stop()
 
-question = st.text_input("What's your question?")
-if question:
-    try:
-        answer = model(question) if callable(model) else "Model not callable"
-        st.write("Predicted answer:", answer)
-    except Exception as e:
-        st.error(f"Prediction failed: {e}")
+def display_qa(loader):
+    """Q&A box: a warming-up note until the model is ready, then questions."""
+    if loader.status == FAILED:
+        st.warning(f"The Q&A assistant is unavailable right now: {loader.error}")
+        return
+    if loader.status != READY:
+        st.text_input("What's your question?", disabled=True, placeholder="Warming up...")
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.info("⏳ The Q&A assistant is warming up. Explore the page and check back in a moment.")
+        with col2:
+            st.button("🔄 Check again")
+        return
 
+    question = st.text_input("What's your question?")
+    if question:
+        if not callable(loader.model):
+            st.write("Predicted answer:", "Model not callable")
+            return
+        try:
+            answer = ask_model(question)
+        except Exception as e:
+            st.error(f"Prediction failed: {e}")
+            return
+        st.write("Predicted answer:", answer.text)
+        display_sources(answer.sources)
+
+
+def display_sources(sections):
+    """Links to the lesson sections the answer drew on."""
+    if not sections:
+        return
+    st.markdown("**📚 Learn more in the lessons:**")
+    for section in sections:
+        st.page_link(page_path(section["page"]), label=f"Go to page: {section['page']} - {section['title']}", icon="📖")
 
-import streamlit as st
-import pandas as pd
-import numpy as np
 
 # --- Reduce white space on top and under graph title ---
 st.markdown(
@@ -249,3 +271,6 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+with qa_box:
+    display_qa(model_loader)
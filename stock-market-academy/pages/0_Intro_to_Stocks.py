@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
 from utils.content_data import get_welcome_content
+from utils.registry import MODULES
 
 # Configure page
 st.set_page_config(
@@ -13,11 +14,7 @@ st.set_page_config(
 
 # Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
-
-# Initialize bookmarks
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
+    st.session_state.progress_tracker = load_progress_tracker()
 
 def main():
     # Header
@@ -69,22 +66,12 @@ def main():
         
         # Learning path
         st.markdown("### 📚 Learning Path")
-        learning_modules = [
-            ("📈 What is a Stock", "1_📈_What_is_a_Stock"),
-            ("🏢 Why Companies Go Public", "2_🏢_Why_Companies_Go_Public"),
-            ("🛒 Where to Buy Stocks", "3_🛒_Where_to_Buy_Stocks"),
-            ("📊 Stock Exchanges", "4_📊_Stock_Exchanges"),
-            ("💰 Stock Pricing", "5_💰_Stock_Pricing"),
-            ("☕ Market Analogies", "6_☕_Market_Analogies"),
-            ("📋 Market Indices", "7_📋_Market_Indices")
-        ]
-        
-        for title, page_key in learning_modules:
-            completed = st.session_state.progress_tracker.is_completed(page_key)
+        for module in MODULES:
+            completed = st.session_state.progress_tracker.is_completed(module.key)
             if completed:
-                st.success(f"✅ {title}")
+                st.success(f"✅ {module.icon} {module.title}")
             else:
-                st.info(f"⏳ {title}")
+                st.info(f"⏳ {module.icon} {module.title}")
 
     # Investment Calculator Section
     st.markdown("---")
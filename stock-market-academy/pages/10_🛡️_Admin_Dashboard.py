@@ -0,0 +1,220 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from utils.analytics_job import get_analytics_job
+from utils.answer_cache import get_answer_cache
+from utils.database import get_database
+from utils.identity import admin_enabled, is_admin, sign_in_admin
+from utils.qa_model import READY, get_inference_service, get_model_loader
+from utils.quiz_engine import QUIZ_BANK
+from utils.registry import BY_KEY
+from utils.semantic_cache import get_semantic_cache
+
+st.set_page_config(
+    page_title="Admin Dashboard - Stock Market Academy",
+    page_icon="🛡️",
+    layout="wide"
+)
+
+def display_sign_in():
+    """Ask for the admin token before showing anything"""
+    if not admin_enabled():
+        st.info("The admin dashboard is disabled. Set ACADEMY_ADMIN_TOKEN to enable it.")
+        return
+
+    with st.form("admin_sign_in"):
+        token = st.text_input("Admin token", type="password")
+        if st.form_submit_button("Sign in"):
+            if sign_in_admin(token):
+                st.rerun()
+            st.error("That token isn't valid.")
+
+PERCENT_COLUMNS = ["share_of_cohort", "step_conversion", "drop_rate"]
+# Questions whose top and bottom scorers do about as well are worth a look
+LOW_DISCRIMINATION = 0.2
+
+def display_funnels(aggregates):
+    st.markdown("## 🪜 Module Funnel")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.bar_chart(aggregates.funnel["learners"])
+    with col2:
+        funnel = aggregates.funnel.join(aggregates.drop_off[["dropped", "drop_rate"]])
+        funnel[PERCENT_COLUMNS] *= 100
+        st.dataframe(
+            funnel,
+            column_config={
+                "share_of_cohort": st.column_config.NumberColumn("Share of cohort", format="%.1f%%"),
+                "step_conversion": st.column_config.NumberColumn("Step conversion", format="%.1f%%"),
+                "drop_rate": st.column_config.NumberColumn("Drop rate", format="%.1f%%"),
+            },
+            use_container_width=True,
+        )
+
+    with st.expander("⏱️ Hours to complete"):
+        st.dataframe(aggregates.time_to_complete.round(1), use_container_width=True)
+
+def display_quiz_pass_rates(aggregates):
+    st.markdown("## ✅ Quiz Pass Rates")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.bar_chart(aggregates.quiz_summary["pass_rate"])
+    with col2:
+        st.dataframe(aggregates.quiz_summary.round(3), use_container_width=True)
+
+def display_searches_and_bookmarks(aggregates):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("## 🔍 Top Searches")
+        if aggregates.top_searches.empty:
+            st.caption("No searches yet.")
+        else:
+            st.dataframe(aggregates.top_searches, use_container_width=True)
+    with col2:
+        st.markdown("## ⭐ Bookmark Hotspots")
+        if aggregates.bookmark_hotspots.empty:
+            st.caption("No bookmarks saved yet.")
+        else:
+            st.dataframe(aggregates.bookmark_hotspots, hide_index=True, use_container_width=True)
+
+def load_question_stats():
+    """The batch-computed question stats, joined with the current quiz text"""
+    rows = get_database().query(
+        "SELECT module, question, attempts, p_value, discrimination, option_counts, computed_at "
+        "FROM question_stats"
+    )
+    stats = pd.DataFrame.from_records(
+        rows,
+        columns=["module", "question", "attempts", "p_value", "discrimination", "option_counts", "computed_at"],
+    )
+    rows = {
+        (module, question.key): (quiz, row)
+        for module, quiz in QUIZ_BANK.items() for row, question in enumerate(quiz.questions)
+    }
+    located = [rows.get(key) for key in zip(stats["module"], stats["question"])]
+    stats = stats.assign(located=located).dropna(subset=["located"])
+    stats["lesson"] = stats["module"].map(lambda module: BY_KEY[module].title)
+    stats["prompt"] = [quiz.questions[row].review for quiz, row in stats["located"]]
+    return stats
+
+def display_option_counts(quiz, row, counts):
+    options = pd.DataFrame({
+        "option": quiz.questions[row].options,
+        "answer": ["✅" if correct else "" for correct in quiz.answer_key[row][:len(counts)]],
+        "picks": counts,
+    })
+    st.dataframe(
+        options,
+        column_config={
+            "picks": st.column_config.ProgressColumn(
+                "Picks", format="%d", min_value=0, max_value=max(counts)
+            ),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+def display_question_stats():
+    st.markdown("## 🧩 Question Statistics")
+    stats = load_question_stats()
+    if stats.empty:
+        st.caption("No question statistics yet. Run `python -m utils.question_stats` to compute them.")
+        return
+
+    computed = datetime.fromtimestamp(stats["computed_at"].max()).strftime("%Y-%m-%d %H:%M:%S")
+    st.caption(
+        f"Computed {computed} from each learner's first attempt. The p-value is the share "
+        "answering correctly; discrimination is the p-value of the top 27% of scorers minus "
+        f"the bottom 27%. Below {LOW_DISCRIMINATION} the question or its options may need work."
+    )
+    stats = stats.sort_values("p_value")
+    table = stats[["lesson", "prompt", "attempts", "p_value", "discrimination"]].assign(
+        p_value=stats["p_value"] * 100,
+        flag=(stats["discrimination"] < LOW_DISCRIMINATION).map({True: "⚠️", False: ""}),
+    )
+    st.dataframe(
+        table,
+        column_config={
+            "p_value": st.column_config.NumberColumn("Answered correctly", format="%.1f%%"),
+            "discrimination": st.column_config.NumberColumn("Discrimination", format="%.2f"),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    choice = st.selectbox(
+        "Option picks for:", range(len(stats)),
+        format_func=lambda i: f"{stats['lesson'].iloc[i]} - {stats['prompt'].iloc[i]}",
+    )
+    quiz, row = stats["located"].iloc[choice]
+    counts = json.loads(stats["option_counts"].iloc[choice])
+    if sum(counts):
+        display_option_counts(quiz, row, counts)
+    else:
+        st.caption("No recorded option picks for this question yet.")
+
+def display_answer_cache():
+    st.markdown("## 🤖 Q&A Answer Cache")
+    stats = get_answer_cache().stats()
+    near = get_semantic_cache().stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Exact hit rate", f"{stats['hit_rate']:.1%}")
+    with col2:
+        st.metric("Paraphrase hit rate", f"{near['hit_rate']:.1%}")
+    with col3:
+        st.metric("Cached answers", f"{stats['entries']} / {near['entries']}")
+    with col4:
+        st.metric("Expired / evicted", f"{stats['expirations']} / {stats['evictions']}")
+    st.caption(
+        f"Since this server started: {stats['hits']} exact hits, {near['hits']} paraphrase hits and "
+        f"{near['misses']} model calls. The paraphrase rate is out of exact-cache misses. The caches "
+        f"have been cleared {stats['invalidations']} time(s) for a new model version."
+    )
+    if get_model_loader().status == READY:
+        batcher = get_inference_service()
+        st.caption(
+            f"The model has run {batcher.batches} forward pass(es), "
+            f"averaging {batcher.mean_batch_size:.1f} question(s) each."
+        )
+
+def main():
+    st.title("🛡️ Admin Dashboard")
+    st.markdown("### *How Learners Move Through the Academy*")
+
+    if not is_admin():
+        display_sign_in()
+        return
+
+    # Aggregates are kept current by a background job; this page only reads them
+    aggregates = get_analytics_job().latest
+    if aggregates is None:
+        st.info("Aggregates are being computed. Check back in a moment.")
+        if st.button("🔄 Refresh"):
+            st.rerun()
+        return
+
+    refreshed = datetime.fromtimestamp(aggregates.refreshed_at).strftime("%Y-%m-%d %H:%M:%S")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Learners", aggregates.learners)
+    with col2:
+        st.metric("Processed up to event #", aggregates.watermark)
+    with col3:
+        st.metric("Last refreshed", refreshed)
+
+    st.markdown("---")
+    display_funnels(aggregates)
+    st.markdown("---")
+    display_quiz_pass_rates(aggregates)
+    st.markdown("---")
+    display_searches_and_bookmarks(aggregates)
+    st.markdown("---")
+    display_question_stats()
+    st.markdown("---")
+    display_answer_cache()
+
+if __name__ == "__main__":
+    main()
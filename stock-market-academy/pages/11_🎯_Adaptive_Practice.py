@@ -0,0 +1,102 @@
+import streamlit as st
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import flush_bookmarks
+from utils.events import ADAPTIVE_ANSWER, get_event_buffer, make_event
+from utils.irt import get_adaptive_session
+from utils.quiz_engine import ask
+from utils.numeric_questions import TEMPLATES, render_numeric_practice
+
+st.set_page_config(
+    page_title="Adaptive Practice - Stock Market Academy",
+    page_icon="🎯",
+    layout="wide"
+)
+
+# Initialize progress tracker
+if 'progress_tracker' not in st.session_state:
+    st.session_state.progress_tracker = load_progress_tracker()
+
+def restart_practice():
+    """Start a new practice run from the default ability estimate"""
+    del st.session_state.adaptive_session
+
+def display_feedback():
+    """Show how the previous answer went"""
+    feedback = st.session_state.pop('adaptive_feedback', None)
+    if feedback:
+        correct, message = feedback
+        if correct:
+            st.success(message or "✅ Correct!")
+        else:
+            st.error(message or "❌ Not quite.")
+
+def display_question(session, index):
+    """Ask the selected bank question and record the answer"""
+    module, question = session.bank.question(index)
+    st.markdown(f"#### 📖 From: {module.icon} {module.title}")
+
+    with st.form(f"adaptive_{len(session.order)}"):
+        response = ask(question, key=f"adaptive_{session.bank.ids[index]}")
+        if st.form_submit_button("Submit Answer"):
+            correct = session.bank.is_correct(index, response)
+            session.answer(index, correct)
+            get_event_buffer().put(make_event(
+                session.user_id, ADAPTIVE_ANSWER, module.key,
+                item_id=session.bank.ids[index], correct=correct, ability=session.theta,
+            ))
+            message = question.correct if correct else question.incorrect or question.distractor
+            st.session_state.adaptive_feedback = (correct, message)
+            st.rerun()
+
+def main():
+    st.title("🎯 Adaptive Practice")
+    st.markdown("### *Questions Matched to What You Know*")
+
+    # Navigation
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("🏠 Home"):
+            st.switch_page("app.py")
+    with col3:
+        st.button("🔄 Start Over", on_click=restart_practice)
+
+    st.markdown("---")
+
+    session = get_adaptive_session()
+
+    # Ability summary
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Questions Answered", len(session.order))
+    with col2:
+        st.metric("Correct", sum(session.correct))
+    with col3:
+        st.metric("Skill Estimate", f"{session.theta:+.1f} ± {session.standard_error:.1f}")
+
+    display_feedback()
+
+    index = session.next_item()
+    if index is None:
+        st.balloons()
+        st.success("🎉 You've answered every question in the bank! Start over to practice again.")
+    else:
+        display_question(session, index)
+
+    # Generated number questions
+    st.markdown("---")
+    st.markdown("## 🔢 Number Crunch")
+    st.markdown("Fresh numbers every time - work these out with a calculator.")
+    render_numeric_practice(list(TEMPLATES), key="adaptive")
+
+    with st.expander("💡 **How Adaptive Practice Works**"):
+        st.markdown("""
+        - Each answer updates an estimate of your skill
+        - The next question is the one that tells us the most at your current level
+        - Get questions right and they get harder; miss one and the next is gentler
+        - Questions come from every lesson's quiz, so revisit lessons if a topic feels new
+        - Number Crunch questions are generated, so there is always a new one to try
+        """)
+
+if __name__ == "__main__":
+    main()
+    flush_bookmarks()
@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
 
 st.set_page_config(
     page_title="What is a Stock? - Stock Market Academy",
@@ -9,19 +12,10 @@ st.set_page_config(
 
 # Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-# Initialize bookmarks
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "What is a Stock"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("1_📈_What_is_a_Stock")
+PAGE = MODULE.title
 
 def main():
     st.title("📈 What is a Stock?")
@@ -50,7 +44,7 @@ def main():
         
         # Bookmark button for definition
         if st.button("⭐ Bookmark Definition", key="def_bookmark"):
-            add_to_bookmarks("Stock Definition", "A stock represents partial ownership in a company")
+            add_to_bookmarks(PAGE, "Stock Definition", "A stock represents partial ownership in a company")
     
     st.markdown("---")
     
@@ -73,7 +67,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Handbag Analogy", key="handbag_bookmark"):
-            add_to_bookmarks("Handbag Analogy", "Buying stocks is like joining friends to buy a designer handbag together")
+            add_to_bookmarks(PAGE, "Handbag Analogy", "Buying stocks is like joining friends to buy a designer handbag together")
     
     # Visual representation
     st.markdown("---")
@@ -103,45 +97,7 @@ def main():
     
     # Interactive Quiz Section
     st.markdown("---")
-    st.markdown("## 🧠 Quick Knowledge Check")
-    
-    with st.form("stock_quiz"):
-        st.markdown("**Test your understanding:**")
-        
-        q1 = st.radio(
-            "When you buy a stock, you become:",
-            ["A lender to the company", "A partial owner of the company", "An employee of the company", "A customer of the company"],
-            key="q1"
-        )
-        
-        q2 = st.radio(
-            "In the handbag analogy, what does your investment amount represent?",
-            ["The price of the handbag", "Your share of ownership", "The store where you buy", "The friends you're with"],
-            key="q2"
-        )
-        
-        submitted = st.form_submit_button("Check My Answers")
-        
-        if submitted:
-            score = 0
-            if q1 == "A partial owner of the company":
-                st.success("✅ Correct! You become a partial owner.")
-                score += 1
-            else:
-                st.error("❌ Not quite. When you buy stock, you become a partial owner of the company.")
-            
-            if q2 == "Your share of ownership":
-                st.success("✅ Correct! Your investment determines your ownership share.")
-                score += 1
-            else:
-                st.error("❌ Not quite. Your investment amount determines your share of ownership.")
-            
-            st.info(f"Your Score: {score}/2")
-            
-            if score == 2:
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("1_📈_What_is_a_Stock")
-                st.success("🎉 Perfect! You've mastered the basics of what a stock is!")
+    render_quiz(MODULE)
     
     # Key Takeaways
     st.markdown("---")
@@ -159,7 +115,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Key Takeaways", key="takeaways_bookmark"):
-            add_to_bookmarks("Stock Basics - Key Takeaways", "5 essential points about stock ownership")
+            add_to_bookmarks(PAGE, "Stock Basics - Key Takeaways", "5 essential points about stock ownership")
     
     # Navigation footer
     st.markdown("---")
@@ -179,3 +135,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
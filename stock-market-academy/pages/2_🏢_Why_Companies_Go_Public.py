@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
 
 st.set_page_config(
     page_title="Why Companies Go Public - Stock Market Academy",
@@ -7,20 +10,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize progress tracker and bookmarks
+# Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Why Companies Go Public"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("2_🏢_Why_Companies_Go_Public")
+PAGE = MODULE.title
 
 def main():
     st.title("🏢 Why Would Companies Sell Their Stocks?")
@@ -60,7 +55,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Going Public Definition", key="public_def"):
-            add_to_bookmarks("Going Public", "When a private company sells shares to the public for the first time")
+            add_to_bookmarks(PAGE, "Going Public", "When a private company sells shares to the public for the first time")
     
     # Reasons for Going Public
     st.markdown("## 🎯 Why Companies Choose to Go Public")
@@ -123,7 +118,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Pizza Shop Story", key="pizza_story"):
-            add_to_bookmarks("Pizza Shop Analogy", "How Sarah's pizza shop went public to fund expansion")
+            add_to_bookmarks(PAGE, "Pizza Shop Analogy", "How Sarah's pizza shop went public to fund expansion")
     
     # Benefits and Trade-offs
     st.markdown("---")
@@ -155,50 +150,7 @@ def main():
     
     # Interactive section
     st.markdown("---")
-    st.markdown("## 🧠 Test Your Understanding")
-    
-    with st.form("public_quiz"):
-        st.markdown("**Quick Check:** Why might a company choose to go public?")
-        
-        reasons = st.multiselect(
-            "Select all correct reasons:",
-            [
-                "To raise money for expansion",
-                "To pay off existing debt", 
-                "To acquire other businesses",
-                "To avoid paying taxes",
-                "To provide exit opportunities for early investors",
-                "To increase company visibility"
-            ]
-        )
-        
-        submitted = st.form_submit_button("Check My Answer")
-        
-        if submitted:
-            correct_reasons = {
-                "To raise money for expansion",
-                "To pay off existing debt", 
-                "To acquire other businesses",
-                "To provide exit opportunities for early investors",
-                "To increase company visibility"
-            }
-            
-            selected_set = set(reasons)
-            
-            if "To avoid paying taxes" in selected_set:
-                st.error("❌ Going public doesn't help avoid taxes - that's incorrect!")
-            
-            correct_selected = selected_set.intersection(correct_reasons)
-            score = len(correct_selected)
-            
-            if score >= 4:
-                st.success(f"🎉 Excellent! You selected {score} correct reasons!")
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("2_🏢_Why_Companies_Go_Public")
-            elif score >= 2:
-                st.info(f"Good job! You got {score} correct reasons. Review the content for the ones you missed.")
-            else:
-                st.warning("Keep learning! Review the reasons why companies go public.")
+    render_quiz(MODULE)
     
     # Key takeaways
     st.markdown("---")
@@ -215,7 +167,7 @@ def main():
     """)
     
     if st.button("⭐ Bookmark Key Takeaways", key="takeaways"):
-        add_to_bookmarks("Going Public - Key Takeaways", "5 essential points about why companies go public")
+        add_to_bookmarks(PAGE, "Going Public - Key Takeaways", "5 essential points about why companies go public")
     
     # Navigation footer
     st.markdown("---")
@@ -235,3 +187,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
 
 st.set_page_config(
     page_title="Where to Buy Stocks - Stock Market Academy",
@@ -7,20 +10,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize progress tracker and bookmarks
+# Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Where to Buy Stocks"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("3_🛒_Where_to_Buy_Stocks")
+PAGE = MODULE.title
 
 def main():
     st.title("🛒 Where Can I Buy These Stocks?")
@@ -67,7 +62,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Primary Market Info", key="primary_bookmark"):
-            add_to_bookmarks("Primary Market", "Where companies sell shares for the first time through IPOs")
+            add_to_bookmarks(PAGE, "Primary Market", "Where companies sell shares for the first time through IPOs")
     
     # Secondary Market Section
     with st.expander("🔄 **Secondary Market: Trading Among Investors**", expanded=True):
@@ -90,7 +85,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Secondary Market Info", key="secondary_bookmark"):
-            add_to_bookmarks("Secondary Market", "Where investors trade existing shares among themselves")
+            add_to_bookmarks(PAGE, "Secondary Market", "Where investors trade existing shares among themselves")
     
     # Visual Comparison
     st.markdown("---")
@@ -146,7 +141,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark House Analogy", key="house_analogy"):
-            add_to_bookmarks("House Buying Analogy", "Primary market = new construction, Secondary market = existing homes")
+            add_to_bookmarks(PAGE, "House Buying Analogy", "Primary market = new construction, Secondary market = existing homes")
     
     # How to Actually Buy Stocks
     st.markdown("---")
@@ -177,60 +172,7 @@ def main():
     
     # Interactive Quiz
     st.markdown("---")
-    st.markdown("## 🧠 Test Your Market Knowledge")
-    
-    with st.form("market_quiz"):
-        q1 = st.radio(
-            "When you buy Apple stock today on the stock exchange, who receives your money?",
-            ["Apple Inc. (the company)", "Another investor selling their Apple shares", "The stock exchange", "The government"],
-            key="market_q1"
-        )
-        
-        q2 = st.radio(
-            "What is an IPO?",
-            ["A way to buy stocks cheaply", "When a company sells shares to the public for the first time", "A type of stock exchange", "When stock prices go up"],
-            key="market_q2"
-        )
-        
-        q3 = st.radio(
-            "Which market provides more buying opportunities for regular investors?",
-            ["Primary Market", "Secondary Market", "Both are equal", "Neither"],
-            key="market_q3"
-        )
-        
-        submitted = st.form_submit_button("Check My Understanding")
-        
-        if submitted:
-            score = 0
-            
-            if q1 == "Another investor selling their Apple shares":
-                st.success("✅ Correct! In secondary market trading, you buy from other investors.")
-                score += 1
-            else:
-                st.error("❌ When buying on exchanges, you're buying from other investors, not the company.")
-            
-            if q2 == "When a company sells shares to the public for the first time":
-                st.success("✅ Correct! IPO = Initial Public Offering.")
-                score += 1
-            else:
-                st.error("❌ IPO stands for Initial Public Offering - the first time a company sells shares publicly.")
-            
-            if q3 == "Secondary Market":
-                st.success("✅ Correct! Secondary markets are open daily for trading.")
-                score += 1
-            else:
-                st.error("❌ Secondary markets provide more opportunities since they're open for trading every business day.")
-            
-            st.info(f"Your Score: {score}/3")
-            
-            if score == 3:
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("3_🛒_Where_to_Buy_Stocks")
-                st.success("🎉 Perfect! You understand how stock markets work!")
-            elif score >= 2:
-                st.info("Great job! Review the areas you missed.")
-            else:
-                st.warning("Keep studying! Understanding markets is crucial for investing.")
+    render_quiz(MODULE)
     
     # Key Takeaways
     st.markdown("---")
@@ -247,7 +189,7 @@ def main():
     """)
     
     if st.button("⭐ Bookmark Key Takeaways", key="takeaways"):
-        add_to_bookmarks("Stock Markets - Key Takeaways", "Understanding primary vs secondary markets")
+        add_to_bookmarks(PAGE, "Stock Markets - Key Takeaways", "Understanding primary vs secondary markets")
     
     # Navigation footer
     st.markdown("---")
@@ -267,3 +209,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
 
 st.set_page_config(
     page_title="Stock Exchanges - Stock Market Academy",
@@ -7,20 +10,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize progress tracker and bookmarks
+# Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Stock Exchanges"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("4_📊_Stock_Exchanges")
+PAGE = MODULE.title
 
 def main():
     st.title("📊 How Do Stock Exchanges Work?")
@@ -84,7 +79,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Mall Analogy", key="mall_analogy"):
-            add_to_bookmarks("Mall Analogy", "Stock exchanges work like shopping malls with shops (companies) and shoppers (investors)")
+            add_to_bookmarks(PAGE, "Mall Analogy", "Stock exchanges work like shopping malls with shops (companies) and shoppers (investors)")
     
     # How Companies Join
     st.markdown("---")
@@ -205,7 +200,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Trading Process", key="trading_process"):
-            add_to_bookmarks("Trading Process", "How stock trades are executed on exchanges")
+            add_to_bookmarks(PAGE, "Trading Process", "How stock trades are executed on exchanges")
     
     # Exchange Functions
     st.markdown("---")
@@ -235,59 +230,7 @@ def main():
     
     # Interactive Quiz
     st.markdown("---")
-    st.markdown("## 🧠 Exchange Knowledge Check")
-    
-    with st.form("exchange_quiz"):
-        q1 = st.radio(
-            "In the mall analogy, what do the individual shops represent?",
-            ["Stock exchanges", "Companies listed on the exchange", "Investors", "Brokers"],
-            key="exchange_q1"
-        )
-        
-        q2 = st.radio(
-            "What is the primary role of stock exchange management?",
-            ["To set stock prices", "To ensure fair trading and maintain records", "To give investment advice", "To guarantee profits"],
-            key="exchange_q2"
-        )
-        
-        q3 = st.multiselect(
-            "Which of these are major stock exchanges?",
-            ["NYSE", "NASDAQ", "BSE", "NSE", "McDonald's", "Apple Store"],
-            key="exchange_q3"
-        )
-        
-        submitted = st.form_submit_button("Check My Knowledge")
-        
-        if submitted:
-            score = 0
-            
-            if q1 == "Companies listed on the exchange":
-                st.success("✅ Correct! Individual shops represent companies.")
-                score += 1
-            else:
-                st.error("❌ In the mall analogy, shops represent companies listed on the exchange.")
-            
-            if q2 == "To ensure fair trading and maintain records":
-                st.success("✅ Correct! Exchanges ensure fair, transparent trading.")
-                score += 1
-            else:
-                st.error("❌ Exchange management ensures fair trading and keeps records.")
-            
-            correct_exchanges = {"NYSE", "NASDAQ", "BSE", "NSE"}
-            selected_exchanges = set(q3)
-            
-            if correct_exchanges.issubset(selected_exchanges) and not {"McDonald's", "Apple Store"}.intersection(selected_exchanges):
-                st.success("✅ Perfect! You identified all the stock exchanges correctly.")
-                score += 1
-            else:
-                st.error("❌ NYSE, NASDAQ, BSE, and NSE are stock exchanges. McDonald's and Apple Store are not!")
-            
-            st.info(f"Your Score: {score}/3")
-            
-            if score == 3:
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("4_📊_Stock_Exchanges")
-                st.success("🎉 Excellent! You understand how stock exchanges work!")
+    render_quiz(MODULE)
     
     # Key Takeaways
     st.markdown("---")
@@ -304,7 +247,7 @@ def main():
     """)
     
     if st.button("⭐ Bookmark Key Takeaways", key="takeaways"):
-        add_to_bookmarks("Stock Exchanges - Key Takeaways", "How exchanges work as organized marketplaces")
+        add_to_bookmarks(PAGE, "Stock Exchanges - Key Takeaways", "How exchanges work as organized marketplaces")
     
     # Navigation footer
     st.markdown("---")
@@ -324,3 +267,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
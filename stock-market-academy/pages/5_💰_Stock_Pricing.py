@@ -1,5 +1,9 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
+from utils.numeric_questions import render_numeric_practice
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -9,20 +13,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize progress tracker and bookmarks
+# Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Stock Pricing"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("5_💰_Stock_Pricing")
+PAGE = MODULE.title
 
 def create_supply_demand_chart():
     """Create a simple supply and demand visualization"""
@@ -148,7 +144,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Company Factors", key="company_factors"):
-            add_to_bookmarks("Company Performance Factors", "How company results affect stock prices")
+            add_to_bookmarks(PAGE, "Company Performance Factors", "How company results affect stock prices")
     
     with tab2:
         st.markdown("""
@@ -254,7 +250,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Volatility Info", key="volatility_info"):
-            add_to_bookmarks("Stock Volatility", "Understanding why stock prices swing up and down")
+            add_to_bookmarks(PAGE, "Stock Volatility", "Understanding why stock prices swing up and down")
     
     # Interactive Price Simulation
     st.markdown("---")
@@ -310,61 +306,14 @@ def main():
         5. 🎯 **Expectations matter** - beating them is key
         """)
     
+    # Number Practice
+    st.markdown("---")
+    st.markdown("## 🔢 Practice with Numbers")
+    render_numeric_practice(["pe_ratio"], key="pricing")
+
     # Quiz Section
     st.markdown("---")
-    st.markdown("## 🧠 Price Discovery Quiz")
-    
-    with st.form("pricing_quiz"):
-        q1 = st.radio(
-            "What is the primary factor that determines stock prices?",
-            ["The company CEO", "Government regulations", "Supply and demand", "The stock exchange"],
-            key="pricing_q1"
-        )
-        
-        q2 = st.radio(
-            "If more people want to buy a stock than sell it, what happens to the price?",
-            ["It goes down", "It goes up", "It stays the same", "It becomes volatile"],
-            key="pricing_q2"
-        )
-        
-        q3 = st.multiselect(
-            "Which factors can influence stock prices? (Select all that apply)",
-            ["Company earnings", "Economic conditions", "Market sentiment", "News events", "The weather", "Industry trends"],
-            key="pricing_q3"
-        )
-        
-        submitted = st.form_submit_button("Test My Understanding")
-        
-        if submitted:
-            score = 0
-            
-            if q1 == "Supply and demand":
-                st.success("✅ Correct! Supply and demand drive stock prices.")
-                score += 1
-            else:
-                st.error("❌ Stock prices are determined by supply and demand in the market.")
-            
-            if q2 == "It goes up":
-                st.success("✅ Right! High demand with low supply pushes prices up.")
-                score += 1
-            else:
-                st.error("❌ When demand exceeds supply, prices rise.")
-            
-            correct_factors = {"Company earnings", "Economic conditions", "Market sentiment", "News events", "Industry trends"}
-            selected_factors = set(q3)
-            
-            if correct_factors.issubset(selected_factors) and "The weather" not in selected_factors:
-                st.success("✅ Perfect! You identified the key price factors.")
-                score += 1
-            else:
-                st.error("❌ All except 'The weather' can influence stock prices!")
-            
-            st.info(f"Your Score: {score}/3")
-            
-            if score == 3:
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("5_💰_Stock_Pricing")
-                st.success("🎉 Excellent! You understand how stock prices work!")
+    render_quiz(MODULE)
     
     # Key Takeaways
     st.markdown("---")
@@ -381,7 +330,7 @@ def main():
     """)
     
     if st.button("⭐ Bookmark Key Takeaways", key="takeaways"):
-        add_to_bookmarks("Stock Pricing - Key Takeaways", "How supply, demand, and various factors determine stock prices")
+        add_to_bookmarks(PAGE, "Stock Pricing - Key Takeaways", "How supply, demand, and various factors determine stock prices")
     
     # Navigation footer
     st.markdown("---")
@@ -401,3 +350,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
 import plotly.graph_objects as go
 
 st.set_page_config(
@@ -8,20 +11,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize progress tracker and bookmarks
+# Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Market Analogies"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("6_☕_Market_Analogies")
+PAGE = MODULE.title
 
 def create_trend_chart():
     """Create a chart showing coffee vs matcha popularity over time"""
@@ -137,7 +132,7 @@ def main():
         st.plotly_chart(create_trend_chart(), use_container_width=True)
         
         if st.button("⭐ Bookmark Coffee vs Matcha", key="coffee_matcha"):
-            add_to_bookmarks("Coffee vs Matcha Analogy", "Blue-chip stocks (coffee) vs growth stocks (matcha)")
+            add_to_bookmarks(PAGE, "Coffee vs Matcha Analogy", "Blue-chip stocks (coffee) vs growth stocks (matcha)")
     
     # Investment Strategy Lessons
     st.markdown("---")
@@ -184,7 +179,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Investment Lessons", key="investment_lessons"):
-            add_to_bookmarks("Investment Strategy Lessons", "What coffee vs matcha teaches about investment timing and strategy")
+            add_to_bookmarks(PAGE, "Investment Strategy Lessons", "What coffee vs matcha teaches about investment timing and strategy")
     
     # Beauty Products Analogy
     st.markdown("---")
@@ -233,7 +228,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Beauty Basket", key="beauty_basket"):
-            add_to_bookmarks("Beauty Basket Analogy", "How market indices work like tracking a basket of beauty products")
+            add_to_bookmarks(PAGE, "Beauty Basket Analogy", "How market indices work like tracking a basket of beauty products")
     
     # Weighted Analogy
     st.markdown("---")
@@ -310,60 +305,11 @@ def main():
             """)
         
         if st.button("⭐ Bookmark Seesaw Weighting", key="seesaw_weight"):
-            add_to_bookmarks("Seesaw Index Weighting", "Why larger companies have more impact on market indices")
+            add_to_bookmarks(PAGE, "Seesaw Index Weighting", "Why larger companies have more impact on market indices")
     
     # Quiz Section
     st.markdown("---")
-    st.markdown("## 🧠 Analogy Knowledge Check")
-    
-    with st.form("analogy_quiz"):
-        q1 = st.radio(
-            "In the coffee vs matcha analogy, what type of stock does coffee represent?",
-            ["Growth stock", "Blue-chip stock", "Penny stock", "International stock"],
-            key="analogy_q1"
-        )
-        
-        q2 = st.radio(
-            "What does the 'Beauty Basket' analogy help explain?",
-            ["How to buy beauty products", "How market indices work", "How to start a beauty business", "How to invest in beauty companies"],
-            key="analogy_q2"
-        )
-        
-        q3 = st.radio(
-            "In the seesaw analogy, why don't all companies have equal impact on an index?",
-            ["Some companies are older", "Larger companies have more weight/influence", "Some companies are more popular", "It's random"],
-            key="analogy_q3"
-        )
-        
-        submitted = st.form_submit_button("Test My Understanding")
-        
-        if submitted:
-            score = 0
-            
-            if q1 == "Blue-chip stock":
-                st.success("✅ Correct! Coffee represents stable, established blue-chip stocks.")
-                score += 1
-            else:
-                st.error("❌ Coffee represents blue-chip stocks - stable and established.")
-            
-            if q2 == "How market indices work":
-                st.success("✅ Right! The beauty basket shows how indices track market segments.")
-                score += 1
-            else:
-                st.error("❌ The beauty basket analogy explains how market indices work.")
-            
-            if q3 == "Larger companies have more weight/influence":
-                st.success("✅ Perfect! Larger companies have more impact, just like heavier people on a seesaw.")
-                score += 1
-            else:
-                st.error("❌ Like a seesaw, larger companies have more weight and influence in indices.")
-            
-            st.info(f"Your Score: {score}/3")
-            
-            if score == 3:
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("6_☕_Market_Analogies")
-                st.success("🎉 Fantastic! You've mastered market analogies!")
+    render_quiz(MODULE)
     
     # Key Takeaways
     st.markdown("---")
@@ -380,7 +326,7 @@ def main():
     """)
     
     if st.button("⭐ Bookmark All Key Takeaways", key="all_takeaways"):
-        add_to_bookmarks("Market Analogies - All Takeaways", "Key lessons from coffee/matcha, beauty basket, and seesaw analogies")
+        add_to_bookmarks(PAGE, "Market Analogies - All Takeaways", "Key lessons from coffee/matcha, beauty basket, and seesaw analogies")
     
     # Navigation footer
     st.markdown("---")
@@ -400,3 +346,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
@@ -1,5 +1,9 @@
 import streamlit as st
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import load_progress_tracker
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.registry import get_module
+from utils.quiz_engine import render_quiz
+from utils.numeric_questions import render_numeric_practice
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -9,20 +13,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize progress tracker and bookmarks
+# Initialize progress tracker
 if 'progress_tracker' not in st.session_state:
-    st.session_state.progress_tracker = ProgressTracker()
+    st.session_state.progress_tracker = load_progress_tracker()
 
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Market Indices"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
+MODULE = get_module("7_📋_Market_Indices")
+PAGE = MODULE.title
 
 def create_class_performance_chart():
     """Create a chart showing class performance over years"""
@@ -144,7 +140,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark Classroom Analogy", key="class_analogy"):
-            add_to_bookmarks("Classroom Analogy", "Market indices work like class averages tracking student performance")
+            add_to_bookmarks(PAGE, "Classroom Analogy", "Market indices work like class averages tracking student performance")
     
     # Major Indices
     st.markdown("---")
@@ -289,7 +285,7 @@ def main():
         """)
         
         if st.button("⭐ Bookmark ETF Information", key="etf_info"):
-            add_to_bookmarks("Index ETFs", "How to invest in market indices through Exchange-Traded Funds")
+            add_to_bookmarks(PAGE, "Index ETFs", "How to invest in market indices through Exchange-Traded Funds")
     
     # Index Performance Factors
     st.markdown("---")
@@ -321,77 +317,14 @@ def main():
         - ⚠️ **Crisis Events**: Pandemics, wars, financial crises
         """)
     
+    # Number Practice
+    st.markdown("---")
+    st.markdown("## 🔢 Practice with Numbers")
+    render_numeric_practice(["index_weight", "index_move"], key="indices")
+
     # Interactive Quiz
     st.markdown("---")
-    st.markdown("## 🧠 Index Knowledge Challenge")
-    
-    with st.form("index_quiz"):
-        q1 = st.radio(
-            "What does a stock market index represent?",
-            ["A single company's performance", "A group of selected stocks representing market segments", "Government economic policy", "Currency exchange rates"],
-            key="index_q1"
-        )
-        
-        q2 = st.radio(
-            "In the classroom analogy, what does the class average represent?",
-            ["Individual student performance", "The market index", "The teacher's evaluation", "School administration"],
-            key="index_q2"
-        )
-        
-        q3 = st.multiselect(
-            "Which of these are actual market indices?",
-            ["S&P 500", "Nifty 50", "NASDAQ", "Sensex", "Apple Index", "Facebook 100"],
-            key="index_q3"
-        )
-        
-        q4 = st.radio(
-            "How can regular investors buy an entire index?",
-            ["Buy each stock individually", "Through ETFs (Exchange-Traded Funds)", "Contact the stock exchange directly", "It's not possible"],
-            key="index_q4"
-        )
-        
-        submitted = st.form_submit_button("Test My Index Knowledge")
-        
-        if submitted:
-            score = 0
-            
-            if q1 == "A group of selected stocks representing market segments":
-                st.success("✅ Correct! Indices represent groups of stocks from market segments.")
-                score += 1
-            else:
-                st.error("❌ Market indices represent groups of selected stocks, not individual companies.")
-            
-            if q2 == "The market index":
-                st.success("✅ Right! The class average represents the market index.")
-                score += 1
-            else:
-                st.error("❌ In the analogy, the class average represents the market index.")
-            
-            correct_indices = {"S&P 500", "Nifty 50", "NASDAQ", "Sensex"}
-            selected_indices = set(q3)
-            
-            if correct_indices.issubset(selected_indices) and not {"Apple Index", "Facebook 100"}.intersection(selected_indices):
-                st.success("✅ Perfect! You identified all real market indices.")
-                score += 1
-            else:
-                st.error("❌ S&P 500, Nifty 50, NASDAQ, and Sensex are real indices. Apple Index and Facebook 100 don't exist!")
-            
-            if q4 == "Through ETFs (Exchange-Traded Funds)":
-                st.success("✅ Excellent! ETFs allow you to buy entire indices easily.")
-                score += 1
-            else:
-                st.error("❌ ETFs (Exchange-Traded Funds) are the best way to invest in entire indices.")
-            
-            st.info(f"Your Score: {score}/4")
-            
-            if score == 4:
-                st.balloons()
-                st.session_state.progress_tracker.mark_completed("7_📋_Market_Indices")
-                st.success("🎉 Outstanding! You've mastered market indices!")
-            elif score >= 3:
-                st.info("Great job! You have a solid understanding of indices.")
-            else:
-                st.warning("Keep studying! Understanding indices is crucial for investing.")
+    render_quiz(MODULE)
     
     # Key Takeaways
     st.markdown("---")
@@ -409,7 +342,7 @@ def main():
     """)
     
     if st.button("⭐ Bookmark Essential Takeaways", key="essential_takeaways"):
-        add_to_bookmarks("Market Indices - Essential Takeaways", "Key concepts about how market indices work and why they matter")
+        add_to_bookmarks(PAGE, "Market Indices - Essential Takeaways", "Key concepts about how market indices work and why they matter")
     
     # Navigation footer
     st.markdown("---")
@@ -429,3 +362,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
@@ -1,5 +1,10 @@
 import streamlit as st
-from utils.content_data import get_all_content
+from utils.content_data import get_lesson_sections
+from utils.bookmark_store import add_to_bookmarks, flush_bookmarks
+from utils.search import search_content
+from utils.registry import page_path
+from utils.events import SEARCH, get_event_buffer, load_learner_state, make_event
+from utils.identity import get_user_id
 
 st.set_page_config(
     page_title="Search Topics - Stock Market Academy",
@@ -7,66 +12,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize bookmarks
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-
-def add_to_bookmarks(title, content):
-    bookmark = {"title": title, "content": content, "page": "Search Results"}
-    if bookmark not in st.session_state.bookmarks:
-        st.session_state.bookmarks.append(bookmark)
-        st.success("Added to bookmarks! ⭐")
-    else:
-        st.info("Already in bookmarks!")
-
-def search_content(query, content_data):
-    """Search through all content and return matching results, safely."""
-    results = []
-    query_lower = query.lower()
-    
-    for item in content_data:
-        # Only process items that are dicts
-        if not isinstance(item, dict):
-            continue
-
-        title = item.get('title', '')
-        content = item.get('content', '')
-        keywords = item.get('keywords', [])
-
-        # Ensure title and content are strings, keywords is a list
-        if not isinstance(title, str):
-            title = ''
-        if not isinstance(content, str):
-            content = ''
-        if not isinstance(keywords, list):
-            keywords = []
-
-        # Search in title
-        if query_lower in title.lower():
-            results.append({
-                **item,
-                'match_type': 'title',
-                'relevance': 3
-            })
-        # Search in content
-        elif query_lower in content.lower():
-            results.append({
-                **item,
-                'match_type': 'content', 
-                'relevance': 2
-            })
-        # Search in keywords
-        elif any(isinstance(keyword, str) and query_lower in keyword.lower() for keyword in keywords):
-            results.append({
-                **item,
-                'match_type': 'keyword',
-                'relevance': 1
-            })
-    
-    # Sort by relevance (higher first)
-    results.sort(key=lambda x: x['relevance'], reverse=True)
-    return results
-
 def display_search_result(result):
     """Display a single search result"""
     with st.container():
@@ -80,23 +25,14 @@ def display_search_result(result):
         col1, col2, col3 = st.columns([1, 1, 2])
         
         with col1:
-            if st.button(f"⭐ Bookmark", key=f"bookmark_{result['title']}"):
-                add_to_bookmarks(result['title'], result['content'])
+            if st.button(f"⭐ Bookmark", key=f"bookmark_{result['section_id']}"):
+                add_to_bookmarks(result['page'], result['title'], result['content'])
         
         with col2:
-            page_mapping = {
-                "What is a Stock": "pages/1_📈_What_is_a_Stock.py",
-                "Why Companies Go Public": "pages/2_🏢_Why_Companies_Go_Public.py", 
-                "Where to Buy Stocks": "pages/3_🛒_Where_to_Buy_Stocks.py",
-                "Stock Exchanges": "pages/4_📊_Stock_Exchanges.py",
-                "Stock Pricing": "pages/5_💰_Stock_Pricing.py",
-                "Market Analogies": "pages/6_☕_Market_Analogies.py",
-                "Market Indices": "pages/7_📋_Market_Indices.py"
-            }
-            
-            if result['page'] in page_mapping:
-                if st.button(f"📖 Go to Page", key=f"goto_{result['title']}"):
-                    st.switch_page(page_mapping[result['page']])
+            path = page_path(result['page'])
+            if path:
+                if st.button(f"📖 Go to Page", key=f"goto_{result['section_id']}"):
+                    st.switch_page(path)
         
         st.markdown("---")
 
@@ -153,7 +89,7 @@ def main():
         st.markdown(f"## 📋 Search Results for: *'{search_query}'*")
         
         # Get all content
-        all_content = get_all_content()
+        all_content = get_lesson_sections()
         
         # Search through content
         results = search_content(search_query, all_content)
@@ -261,14 +197,15 @@ def main():
         - Browse by learning level (beginner → intermediate)
         """)
     
-    # Recent searches
+    # Recent searches, restored from the learner's journal in a new session
     if 'recent_searches' not in st.session_state:
-        st.session_state.recent_searches = []
+        st.session_state.recent_searches = load_learner_state(get_user_id())["recent_searches"]
     
     # Add current search to recent searches
     if search_query and search_query not in st.session_state.recent_searches:
         st.session_state.recent_searches.insert(0, search_query)
         st.session_state.recent_searches = st.session_state.recent_searches[:5]  # Keep last 5
+        get_event_buffer().put(make_event(get_user_id(), SEARCH, query=search_query))
     
     if st.session_state.recent_searches:
         st.markdown("---")
@@ -283,3 +220,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
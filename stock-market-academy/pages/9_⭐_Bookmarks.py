@@ -1,4 +1,12 @@
+import csv
+from itertools import islice
+
 import streamlit as st
+from utils.bookmark_store import get_bookmarks, flush_bookmarks
+from utils.bookmark_export import EXPORT_FORMATS, export_bookmarks
+from utils.bookmark_import import import_bookmarks
+from utils.registry import BY_TITLE, MODULE_COUNT, page_path
+from utils.review_scheduler import BOOKMARK, GRADES, get_review_queue
 
 st.set_page_config(
     page_title="My Bookmarks - Stock Market Academy",
@@ -7,22 +15,143 @@ st.set_page_config(
 )
 
 # Initialize bookmarks
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
+bookmarks = get_bookmarks()
 
-def remove_bookmark(index):
-    """Remove a bookmark by index"""
-    if 0 <= index < len(st.session_state.bookmarks):
-        removed = st.session_state.bookmarks.pop(index)
+def remove_bookmark(bookmark_id):
+    """Remove a bookmark by id"""
+    removed = bookmarks.remove(bookmark_id)
+    if removed is not None:
         st.success(f"Removed '{removed['title']}' from bookmarks")
         st.rerun()
 
 def clear_all_bookmarks():
     """Clear all bookmarks"""
-    st.session_state.bookmarks = []
+    bookmarks.clear()
     st.success("All bookmarks cleared!")
     st.rerun()
 
+PAGE_SIZES = [5, 10, 25, 50]
+
+def display_bookmark(bookmark_id):
+    """Display a single bookmark with its actions"""
+    bookmark = bookmarks.get(bookmark_id)
+    with st.container():
+        col1, col2 = st.columns([4, 1])
+        
+        with col1:
+            st.markdown(f"### 🔖 {bookmark['title']}")
+            
+            # Show content preview
+            content = bookmark.get('content', 'No content available')
+            if len(content) > 300:
+                if st.toggle("📖 Show Full Content", key=f"show_full_{bookmark_id}"):
+                    st.markdown(content)
+                else:
+                    st.markdown(f"**Preview:** {content[:300]}...")
+            else:
+                st.markdown(f"**Content:** {content}")
+            
+            # Add timestamp if available
+            if 'timestamp' in bookmark:
+                st.caption(f"📅 Saved: {bookmark['timestamp']}")
+        
+        with col2:
+            st.markdown("**Actions:**")
+            
+            # Remove bookmark button
+            if st.button(f"🗑️ Remove", key=f"remove_{bookmark_id}"):
+                remove_bookmark(bookmark_id)
+            
+            # Go to page button (if we can map it)
+            path = page_path(bookmark['page'])
+            if path:
+                if st.button(f"📖 Go to Page", key=f"goto_{bookmark_id}"):
+                    st.switch_page(path)
+        
+        st.markdown("---")
+
+def display_bookmark_group(page, page_bookmarks, page_size):
+    """Display one page of a group's bookmarks with previous/next controls"""
+    state_key = f"bookmark_group_page_{page}"
+    page_count = max(1, -(-len(page_bookmarks) // page_size))
+    current = min(st.session_state.get(state_key, 0), page_count - 1)
+    st.session_state[state_key] = current
+    
+    start = current * page_size
+    for bookmark_id in islice(page_bookmarks, start, start + page_size):
+        display_bookmark(bookmark_id)
+    
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ Previous", key=f"prev_{page}", disabled=current == 0,
+                      on_click=lambda: st.session_state.update({state_key: current - 1}))
+        with col2:
+            st.caption(f"Page {current + 1} of {page_count}")
+        with col3:
+            st.button("Next ▶", key=f"next_{page}", disabled=current == page_count - 1,
+                      on_click=lambda: st.session_state.update({state_key: current + 1}))
+
+REVIEW_LIMIT = 5
+
+def display_review_queue():
+    """Show bookmarks and missed quiz questions that are due for review"""
+    queue = get_review_queue()
+    queue.sync(bookmarks)
+    due = queue.due(limit=REVIEW_LIMIT)
+    
+    st.markdown("## 🧠 Review Now")
+    if not due:
+        st.caption(f"Nothing to review right now. {len(queue)} item(s) scheduled.")
+        return
+    
+    st.caption("Rate how well you remembered each item to schedule its next review.")
+    for item in due:
+        bookmark = bookmarks.get(item.id) if item.kind == BOOKMARK else None
+        if item.kind == BOOKMARK and bookmark is None:
+            continue  # removed in another session since the queue last synced
+        with st.container(border=True):
+            if item.kind == BOOKMARK:
+                st.markdown(f"**🔖 {item.title}**")
+                with st.expander("Show saved content"):
+                    st.markdown(bookmark['content'])
+            else:
+                st.markdown(f"**❓ {item.title}**")
+                st.caption(f"Missed in the {item.page} quiz")
+            
+            cols = st.columns(len(GRADES) + 1)
+            for col, (label, grade) in zip(cols, GRADES.items()):
+                with col:
+                    st.button(label, key=f"grade_{item.id}_{grade}",
+                              on_click=queue.grade, args=(item.id, grade))
+            path = page_path(item.page)
+            if path:
+                with cols[-1]:
+                    if st.button("📖 Go to Page", key=f"review_goto_{item.id}"):
+                        st.switch_page(path)
+    
+    st.markdown("---")
+
+def display_import():
+    """Let users bring back bookmarks from a JSON or CSV export"""
+    with st.expander("📥 **Import Bookmarks**"):
+        st.markdown("Upload a JSON or CSV file exported from this page to restore your bookmarks.")
+        
+        # Result of the import that ran before the last rerun
+        result = st.session_state.pop('bookmark_import_result', None)
+        if result:
+            imported, duplicates, invalid = result
+            st.success(f"Imported {imported} bookmark(s). Skipped {duplicates} already saved and {invalid} invalid.")
+        
+        uploaded_file = st.file_uploader("Bookmark export", type=["json", "csv"], key="bookmark_upload")
+        if uploaded_file is not None and st.button("📥 Import", use_container_width=True):
+            try:
+                st.session_state.bookmark_import_result = import_bookmarks(bookmarks, uploaded_file)
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                st.error(f"Could not read this file: {e}")
+            else:
+                st.rerun()
+
 def main():
     st.title("⭐ My Bookmarks")
     st.markdown("### *Your Saved Learning Content*")
@@ -38,12 +167,14 @@ def main():
     
     st.markdown("---")
     
+    display_review_queue()
+    
     # Bookmarks summary
-    if st.session_state.bookmarks:
+    if bookmarks:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            st.info(f"📚 You have {len(st.session_state.bookmarks)} saved items")
+            st.info(f"📚 You have {len(bookmarks)} saved items")
         
         with col2:
             if st.button("🗑️ Clear All Bookmarks", type="secondary"):
@@ -60,65 +191,45 @@ def main():
         # Display bookmarks
         st.markdown("## 📋 Your Saved Content")
         
-        # Group bookmarks by page
-        bookmarks_by_page = {}
-        for i, bookmark in enumerate(st.session_state.bookmarks):
-            page = bookmark.get('page', 'Unknown')
-            if page not in bookmarks_by_page:
-                bookmarks_by_page[page] = []
-            bookmarks_by_page[page].append((i, bookmark))
-        
-        # Display bookmarks grouped by page
-        for page, page_bookmarks in bookmarks_by_page.items():
-            with st.expander(f"📄 {page} ({len(page_bookmarks)} items)", expanded=True):
-                for bookmark_index, bookmark in page_bookmarks:
-                    with st.container():
-                        col1, col2 = st.columns([4, 1])
-                        
-                        with col1:
-                            st.markdown(f"### 🔖 {bookmark['title']}")
-                            
-                            # Show content preview
-                            content = bookmark.get('content', 'No content available')
-                            if len(content) > 300:
-                                preview = content[:300] + "..."
-                                with st.expander("📖 Preview", expanded=False):
-                                    st.markdown(preview)
-                                    st.markdown("*Click to see full content...*")
-                                    
-                                    if st.button(f"📖 Show Full Content", key=f"show_full_{bookmark_index}"):
-                                        st.markdown("**Full Content:**")
-                                        st.markdown(content)
-                            else:
-                                st.markdown(f"**Content:** {content}")
-                            
-                            # Add timestamp if available
-                            if 'timestamp' in bookmark:
-                                st.caption(f"📅 Saved: {bookmark['timestamp']}")
-                        
-                        with col2:
-                            st.markdown("**Actions:**")
-                            
-                            # Remove bookmark button
-                            if st.button(f"🗑️ Remove", key=f"remove_{bookmark_index}"):
-                                remove_bookmark(bookmark_index)
-                            
-                            # Go to page button (if we can map it)
-                            page_mapping = {
-                                "What is a Stock": "pages/1_📈_What_is_a_Stock.py",
-                                "Why Companies Go Public": "pages/2_🏢_Why_Companies_Go_Public.py", 
-                                "Where to Buy Stocks": "pages/3_🛒_Where_to_Buy_Stocks.py",
-                                "Stock Exchanges": "pages/4_📊_Stock_Exchanges.py",
-                                "Stock Pricing": "pages/5_💰_Stock_Pricing.py",
-                                "Market Analogies": "pages/6_☕_Market_Analogies.py",
-                                "Market Indices": "pages/7_📋_Market_Indices.py"
-                            }
-                            
-                            if bookmark['page'] in page_mapping:
-                                if st.button(f"📖 Go to Page", key=f"goto_{bookmark_index}"):
-                                    st.switch_page(page_mapping[bookmark['page']])
-                        
-                        st.markdown("---")
+        # Bookmarks grouped by page (kept up to date by the bookmark session)
+        bookmarks_by_page = bookmarks.by_page()
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            filter_query = st.text_input(
+                "🔎 Filter your bookmarks:",
+                placeholder="e.g., IPO, index, coffee...",
+                key="bookmark_filter"
+            )
+        
+        with col2:
+            # Page size control: only one page of each group is rendered per rerun
+            page_size = st.selectbox(
+                "Bookmarks per page:", PAGE_SIZES, index=1, key="bookmark_page_size"
+            )
+        
+        if filter_query.strip():
+            # Group only the matches, looked up in the session's word index
+            matches = bookmarks.search(filter_query)
+            matches_by_page = {}
+            for bookmark_id in matches:
+                matches_by_page.setdefault(bookmarks.get(bookmark_id)['page'], []).append(bookmark_id)
+            visible_groups = {
+                page: sorted(matches_by_page[page], key=bookmarks.bookmarks.get)
+                for page in bookmarks_by_page if page in matches_by_page
+            }
+            if visible_groups:
+                st.caption(f"{len(matches)} bookmark(s) match '{filter_query}'")
+            else:
+                st.warning("No bookmarks match your filter.")
+        else:
+            visible_groups = bookmarks_by_page
+        
+        # Display bookmarks grouped by page, collapsed until opened
+        for page, page_bookmarks in visible_groups.items():
+            with st.expander(f"📄 {page} ({len(page_bookmarks)} items)", expanded=bool(filter_query.strip())):
+                display_bookmark_group(page, page_bookmarks, page_size)
         
         # Export bookmarks section
         st.markdown("---")
@@ -127,29 +238,38 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.button("📋 Copy as Text", use_container_width=True):
-                export_text = "# My Stock Market Learning Bookmarks\n\n"
-                for page, page_bookmarks in bookmarks_by_page.items():
-                    export_text += f"## {page}\n\n"
-                    for _, bookmark in page_bookmarks:
-                        export_text += f"### {bookmark['title']}\n"
-                        export_text += f"{bookmark['content']}\n\n"
-                
-                st.text_area("Copy this text:", export_text, height=200)
+            export_format = st.radio("Export format:", list(EXPORT_FORMATS), horizontal=True)
+            _, extension, mime = EXPORT_FORMATS[export_format]
+            
+            # Only build the file on request, and reuse it until bookmarks change
+            export = st.session_state.get('bookmark_export')
+            if export and export[:2] == (export_format, bookmarks.version):
+                st.download_button(
+                    f"⬇️ Download {export_format}",
+                    export[2],
+                    file_name=f"my_bookmarks.{extension}",
+                    mime=mime,
+                    use_container_width=True
+                )
+            elif st.button("📦 Prepare Download", use_container_width=True):
+                st.session_state.bookmark_export = (
+                    export_format, bookmarks.version, export_bookmarks(bookmarks, export_format)
+                )
+                st.rerun()
         
         with col2:
             # Create a summary of bookmarks
             summary = f"""
             **Your Learning Summary:**
             
-            📊 Total Bookmarks: {len(st.session_state.bookmarks)}
+            📊 Total Bookmarks: {len(bookmarks)}
             📚 Pages Covered: {len(bookmarks_by_page)}
             
             **Topics You've Saved:**
             """
             
-            for page, page_bookmarks in bookmarks_by_page.items():
-                summary += f"\n• {page}: {len(page_bookmarks)} items"
+            for page, count in bookmarks.page_counts().items():
+                summary += f"\n• {page}: {count} items"
             
             st.markdown(summary)
     
@@ -188,7 +308,7 @@ def main():
                 st.switch_page("pages/6_☕_Market_Analogies.py")
         
         with col3:
-            if st.button("🔍 Search Topics", use_container_width=True):
+            if st.button("🔍 Search Topics", key="empty_search", use_container_width=True):
                 st.switch_page("pages/8_🔍_Search_Topics.py")
         
         # Example of what bookmarks look like
@@ -209,29 +329,33 @@ def main():
             *Content: Market indices work like tracking a basket of beauty products...*
             """)
     
+    # Import bookmarks section
+    st.markdown("---")
+    display_import()
+    
     # Learning statistics
     st.markdown("---")
-    if st.session_state.bookmarks:
+    if bookmarks:
         st.markdown("## 📊 Your Learning Stats")
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Bookmarks", len(st.session_state.bookmarks))
+            st.metric("Total Bookmarks", len(bookmarks))
         
         with col2:
             st.metric("Pages Covered", len(bookmarks_by_page))
         
         with col3:
-            # Calculate most bookmarked page
-            if bookmarks_by_page:
-                most_bookmarked = max(bookmarks_by_page.items(), key=lambda x: len(x[1]))
-                st.metric("Favorite Topic", f"{most_bookmarked[0]}")
+            # Most bookmarked page
+            favorite_page = bookmarks.favorite_page()
+            if favorite_page:
+                st.metric("Favorite Topic", favorite_page)
         
         with col4:
             # Show learning progress indication
-            total_possible_pages = 7  # Number of main learning pages
-            coverage = min(100, (len(bookmarks_by_page) / total_possible_pages) * 100)
+            lesson_pages_covered = sum(1 for page in bookmarks_by_page if page in BY_TITLE)
+            coverage = (lesson_pages_covered / MODULE_COUNT) * 100
             st.metric("Topic Coverage", f"{coverage:.0f}%")
     
     # Tips section
@@ -247,14 +371,14 @@ def main():
         - Keep track of topics you want to review later
         
         **🔄 Review Process:**
-        - Visit your bookmarks regularly to reinforce learning
+        - Work through the Review Now queue whenever items are due
         - Use bookmarks to create your own study guide
         - Review saved analogies when concepts seem confusing
-        - Export bookmarks as text for offline studying
+        - Download bookmarks as Markdown, JSON or CSV for offline studying
         
         **🗂️ Organization Tips:**
         - Bookmarks are automatically grouped by page
-        - Use the search function to find specific saved content
+        - Use the filter box to find specific saved content
         - Clear outdated bookmarks to keep your collection relevant
         - Focus on saving actionable insights, not just definitions
         
@@ -277,7 +401,7 @@ def main():
             st.switch_page("pages/8_🔍_Search_Topics.py")
     
     with col3:
-        if len(st.session_state.bookmarks) == 0:
+        if len(bookmarks) == 0:
             if st.button("📈 Start Learning", use_container_width=True):
                 st.switch_page("pages/1_📈_What_is_a_Stock.py")
         else:
@@ -287,3 +411,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    flush_bookmarks()
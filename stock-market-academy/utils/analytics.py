@@ -0,0 +1,323 @@
+"""Cohort analytics over learner events.
+
+`CohortAnalytics` keeps per-learner columns as NumPy arrays (one row per
+learner, one column per module) and folds in only the events stored since
+its watermark, so a refresh costs time proportional to the new events and
+the reports are vectorized reductions over those arrays. Times not yet
+reached (a module never completed) are stored as +inf so `np.minimum.at`
+can fold new events in directly. Searches and bookmark saves are kept as
+running counts.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.database import get_database
+from utils.events import BOOKMARK_ADDED, COMPLETION, QUIZ_ATTEMPT, SEARCH
+from utils.quiz_engine import QUIZ_BANK
+from utils.registry import BY_KEY, MODULE_COUNT, MODULES
+
+CHUNK_SIZE = 50_000
+PERCENTILES = [25, 50, 75, 90]
+
+_POSITIONS = {key: module.position for key, module in BY_KEY.items()}
+
+
+def pass_ratios():
+    """Each module quiz's pass mark as a fraction of its total.
+
+    An attempt passes at the lowest score the quiz doesn't answer with a
+    warning: "Good job" on quizzes that have one, full marks otherwise.
+    """
+    ratios = np.ones(MODULE_COUNT)
+    for key, quiz in QUIZ_BANK.items():
+        if key in _POSITIONS and quiz.total:
+            marks = [r.min_score for r in quiz.results if r.level != "warning"]
+            ratios[_POSITIONS[key]] = min(marks, default=quiz.total) / quiz.total
+    return ratios
+
+
+PASS_RATIOS = pass_ratios()
+
+
+class CohortAnalytics:
+    def __init__(self, db):
+        self.db = db
+        self.watermark = 0
+        self.users = pd.Index([], dtype=object)
+        self._size = 0
+        self.started_at = np.empty(0)
+        self.completed_at = np.empty((0, MODULE_COUNT))
+        self.quiz_attempts = np.zeros((0, MODULE_COUNT), dtype=np.int32)
+        self.quiz_passed = np.zeros((0, MODULE_COUNT), dtype=bool)
+        self.quiz_score_sum = np.zeros(MODULE_COUNT)
+        self.search_counts = pd.Series(dtype=np.int64)
+        self.bookmark_counts = pd.Series(dtype=np.int64)
+        self._results = {}
+
+    def __len__(self):
+        return self._size
+
+    def refresh(self):
+        """Fold in events stored since the last refresh; returns how many were read."""
+        latest = self.db.query("SELECT COALESCE(MAX(id), 0) FROM events")[0][0]
+        read = 0
+        while self.watermark < latest:
+            rows = self.db.query(
+                "SELECT id, user_id, kind, module, created_at, "
+                "json_extract(payload, '$.score'), json_extract(payload, '$.total'), "
+                "json_extract(payload, '$.query'), json_extract(payload, '$.bookmark_id') "
+                "FROM events WHERE id > ? AND id <= ? AND kind IN (?, ?, ?, ?) ORDER BY id LIMIT ?",
+                (self.watermark, latest, COMPLETION, QUIZ_ATTEMPT, SEARCH, BOOKMARK_ADDED,
+                 CHUNK_SIZE),
+            )
+            if not rows:
+                self.watermark = latest
+                break
+            frame = pd.DataFrame.from_records(
+                rows,
+                columns=["id", "user_id", "kind", "module", "created_at", "score", "total",
+                         "query", "bookmark_id"],
+            )
+            self._apply(frame)
+            self.watermark = int(frame["id"].iat[-1])
+            read += len(frame)
+        if read:
+            self._results = {}
+        return read
+
+    def _user_rows(self, user_ids):
+        """Row numbers for `user_ids`, adding rows for learners not seen before."""
+        rows = self.users.get_indexer(user_ids)
+        unseen = rows < 0
+        if unseen.any():
+            new_users = pd.unique(user_ids[unseen])
+            self.users = self.users.append(pd.Index(new_users, dtype=object))
+            self._grow(len(self.users))
+            rows[unseen] = self.users.get_indexer(user_ids[unseen])
+        return rows
+
+    def _grow(self, size):
+        if size > len(self.started_at):
+            capacity = max(size, 2 * len(self.started_at), 1024)
+            extra = capacity - len(self.started_at)
+            self.started_at = np.concatenate([self.started_at, np.full(extra, np.inf)])
+            self.completed_at = np.vstack(
+                [self.completed_at, np.full((extra, MODULE_COUNT), np.inf)]
+            )
+            self.quiz_attempts = np.vstack(
+                [self.quiz_attempts, np.zeros((extra, MODULE_COUNT), dtype=np.int32)]
+            )
+            self.quiz_passed = np.vstack(
+                [self.quiz_passed, np.zeros((extra, MODULE_COUNT), dtype=bool)]
+            )
+        self._size = size
+
+    def _apply(self, frame):
+        kinds = frame["kind"].to_numpy()
+        searches = frame["query"][kinds == SEARCH].str.strip().str.lower()
+        self.search_counts = self._count(self.search_counts, searches[searches != ""])
+        saves = frame["bookmark_id"][kinds == BOOKMARK_ADDED]
+        self.bookmark_counts = self._count(self.bookmark_counts, saves)
+
+        frame = frame[(kinds == COMPLETION) | (kinds == QUIZ_ATTEMPT)]
+        rows = self._user_rows(frame["user_id"].to_numpy(dtype=object))
+        positions = frame["module"].map(_POSITIONS).to_numpy()
+        created_at = frame["created_at"].to_numpy(dtype=float)
+        # Unknown modules (removed from the registry) still count as activity
+        known = ~np.isnan(positions.astype(float))
+
+        # A learner starts at their first recorded activity
+        np.minimum.at(self.started_at, rows, created_at)
+
+        completion = known & (frame["kind"].to_numpy() == COMPLETION)
+        np.minimum.at(
+            self.completed_at,
+            (rows[completion], positions[completion].astype(int)),
+            created_at[completion],
+        )
+
+        quiz = known & (frame["kind"].to_numpy() == QUIZ_ATTEMPT)
+        quiz_rows = rows[quiz]
+        quiz_cols = positions[quiz].astype(int)
+        score = frame["score"].to_numpy(dtype=float)[quiz]
+        total = frame["total"].to_numpy(dtype=float)[quiz]
+        ratio = np.divide(score, total, out=np.zeros_like(score), where=total > 0)
+        np.add.at(self.quiz_attempts, (quiz_rows, quiz_cols), 1)
+        np.logical_or.at(self.quiz_passed, (quiz_rows, quiz_cols), ratio >= PASS_RATIOS[quiz_cols])
+        np.add.at(self.quiz_score_sum, quiz_cols, ratio)
+
+    @staticmethod
+    def _count(counts, values):
+        if values.empty:
+            return counts
+        return counts.add(values.value_counts(), fill_value=0).astype(np.int64)
+
+    def save(self, path):
+        """Write the engine's state and watermark to an .npz file, atomically."""
+        temporary = path + ".tmp.npz"
+        np.savez_compressed(
+            temporary,
+            watermark=self.watermark,
+            users=self.users.to_numpy(dtype=str),
+            started_at=self.started_at[:self._size],
+            completed_at=self.completed_at[:self._size],
+            quiz_attempts=self.quiz_attempts[:self._size],
+            quiz_passed=self.quiz_passed[:self._size],
+            pass_ratios=PASS_RATIOS,
+            quiz_score_sum=self.quiz_score_sum,
+            search_terms=self.search_counts.index.to_numpy(dtype=str),
+            search_counts=self.search_counts.to_numpy(),
+            bookmark_ids=self.bookmark_counts.index.to_numpy(dtype=str),
+            bookmark_counts=self.bookmark_counts.to_numpy(),
+        )
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """Restore state written by `save`; returns False if there is none."""
+        try:
+            data = np.load(path, allow_pickle=False)
+        except FileNotFoundError:
+            return False
+        with data:
+            if data["completed_at"].shape[1] != MODULE_COUNT:
+                return False  # the registry changed; rebuild from the events
+            if "pass_ratios" not in data or not np.array_equal(data["pass_ratios"], PASS_RATIOS):
+                return False  # the pass marks changed; rebuild from the events
+            self.watermark = int(data["watermark"])
+            self.users = pd.Index(data["users"].astype(object))
+            self._size = 0
+            self.started_at = np.empty(0)
+            self.completed_at = np.empty((0, MODULE_COUNT))
+            self.quiz_attempts = np.zeros((0, MODULE_COUNT), dtype=np.int32)
+            self.quiz_passed = np.zeros((0, MODULE_COUNT), dtype=bool)
+            self._grow(len(self.users))
+            self.started_at[:self._size] = data["started_at"]
+            self.completed_at[:self._size] = data["completed_at"]
+            self.quiz_attempts[:self._size] = data["quiz_attempts"]
+            self.quiz_passed[:self._size] = data["quiz_passed"]
+            self.quiz_score_sum = data["quiz_score_sum"]
+            self.search_counts = pd.Series(
+                data["search_counts"], index=data["search_terms"].astype(object)
+            )
+            self.bookmark_counts = pd.Series(
+                data["bookmark_counts"], index=data["bookmark_ids"].astype(object)
+            )
+        self._results = {}
+        return True
+
+    def _cached(self, name, compute):
+        if name not in self._results:
+            self._results[name] = compute()
+        return self._results[name]
+
+    def funnel(self):
+        """Learners completing each module, with conversion from the previous step."""
+        return self._cached("funnel", self._funnel)
+
+    def _funnel(self):
+        completed = np.isfinite(self.completed_at[:self._size])
+        learners = completed.sum(axis=0)
+        previous = np.concatenate([[self._size], learners[:-1]])
+        return pd.DataFrame(
+            {
+                "learners": learners,
+                "share_of_cohort": learners / max(self._size, 1),
+                "step_conversion": np.divide(
+                    learners, previous, out=np.zeros(MODULE_COUNT), where=previous > 0
+                ),
+            },
+            index=pd.Index([module.title for module in MODULES], name="module"),
+        )
+
+    def drop_off(self):
+        """Learners who reached each module but haven't completed it.
+
+        A learner reaches the first module by starting, and each later one by
+        completing its prerequisite.
+        """
+        return self._cached("drop_off", self._drop_off)
+
+    def _drop_off(self):
+        completed = np.isfinite(self.completed_at[:self._size])
+        reached = np.ones_like(completed)
+        for module in MODULES:
+            for key in module.prerequisites:
+                reached[:, module.position] &= completed[:, BY_KEY[key].position]
+        reached_count = reached.sum(axis=0)
+        dropped = (reached & ~completed).sum(axis=0)
+        return pd.DataFrame(
+            {
+                "reached": reached_count,
+                "dropped": dropped,
+                "drop_rate": np.divide(
+                    dropped, reached_count, out=np.zeros(MODULE_COUNT), where=reached_count > 0
+                ),
+            },
+            index=pd.Index([module.title for module in MODULES], name="module"),
+        )
+
+    def time_to_complete(self):
+        """Percentiles of hours from a learner's start to each module's completion.
+
+        The "Course" row covers learners who completed every module.
+        """
+        return self._cached("time_to_complete", self._time_to_complete)
+
+    def _time_to_complete(self):
+        completed_at = self.completed_at[:self._size]
+        started_at = self.started_at[:self._size, None]
+        finished = np.column_stack([completed_at, completed_at.max(axis=1, initial=-np.inf)])
+        with np.errstate(invalid="ignore"):
+            hours = np.where(np.isfinite(finished), (finished - started_at) / 3600, np.nan)
+        counts = (~np.isnan(hours)).sum(axis=0)
+        values = np.full((MODULE_COUNT + 1, len(PERCENTILES)), np.nan)
+        for column in np.flatnonzero(counts):
+            values[column] = np.percentile(hours[~np.isnan(hours[:, column]), column], PERCENTILES)
+        frame = pd.DataFrame(
+            values,
+            columns=[f"p{p}" for p in PERCENTILES],
+            index=pd.Index([module.title for module in MODULES] + ["Course"], name="module"),
+        )
+        frame.insert(0, "learners", counts)
+        return frame
+
+    def quiz_summary(self):
+        """Attempts, learners attempting, pass rate and mean score per module quiz."""
+        return self._cached("quiz_summary", self._quiz_summary)
+
+    def _quiz_summary(self):
+        attempts = self.quiz_attempts[:self._size]
+        total_attempts = attempts.sum(axis=0)
+        learners = (attempts > 0).sum(axis=0)
+        passed = self.quiz_passed[:self._size].sum(axis=0)
+        return pd.DataFrame(
+            {
+                "attempts": total_attempts,
+                "learners": learners,
+                "pass_rate": np.divide(
+                    passed, learners, out=np.zeros(MODULE_COUNT), where=learners > 0
+                ),
+                "mean_score": np.divide(
+                    self.quiz_score_sum, total_attempts,
+                    out=np.zeros(MODULE_COUNT), where=total_attempts > 0,
+                ),
+            },
+            index=pd.Index([module.title for module in MODULES], name="module"),
+        )
+
+    def top_searches(self, limit=10):
+        """The most frequent search queries, normalised to lower case."""
+        return self.search_counts.nlargest(limit).rename_axis("query").rename("searches")
+
+    def bookmark_hotspots(self, limit=10):
+        """Ids of the sections saved as bookmarks most often."""
+        return self.bookmark_counts.nlargest(limit).rename_axis("section_id").rename("saves")
+
+
+@st.cache_resource
+def get_cohort_analytics():
+    """The process-wide analytics engine; call `refresh()` before reading."""
+    return CohortAnalytics(get_database())
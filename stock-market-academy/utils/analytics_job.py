@@ -0,0 +1,97 @@
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.analytics import get_cohort_analytics
+from utils.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = os.path.join(os.path.dirname(DB_PATH), "analytics.npz")
+
+# Everything the admin dashboard shows, computed off the request path
+Aggregates = namedtuple(
+    "Aggregates",
+    ["learners", "funnel", "drop_off", "time_to_complete", "quiz_summary",
+     "top_searches", "bookmark_hotspots", "watermark", "refreshed_at"],
+)
+
+
+class AnalyticsJob:
+    """Keep dashboard aggregates current from a background thread.
+
+    The engine's state and event watermark are saved after every refresh
+    that read something, so a restart continues from the watermark instead
+    of rescanning the event history. Readers only ever see `latest`, a
+    finished Aggregates tuple that is replaced as a whole.
+    """
+
+    def __init__(self, analytics, state_path=STATE_PATH, interval=30.0):
+        self.analytics = analytics
+        self.state_path = state_path
+        self.interval = interval
+        self.latest = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="analytics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def refresh(self):
+        """Fold in new events and publish fresh aggregates."""
+        read = self.analytics.refresh()
+        if read:
+            self.analytics.save(self.state_path)
+        if read or self.latest is None:
+            self.latest = self._aggregate()
+        return read
+
+    def _aggregate(self):
+        analytics = self.analytics
+        return Aggregates(
+            learners=len(analytics),
+            funnel=analytics.funnel(),
+            drop_off=analytics.drop_off(),
+            time_to_complete=analytics.time_to_complete(),
+            quiz_summary=analytics.quiz_summary(),
+            top_searches=analytics.top_searches(),
+            bookmark_hotspots=self._resolve_hotspots(analytics.bookmark_hotspots()),
+            watermark=analytics.watermark,
+            refreshed_at=time.time(),
+        )
+
+    def _resolve_hotspots(self, hotspots):
+        """Attach section titles and pages to the most-saved section ids."""
+        ids = list(hotspots.index)
+        rows = self.analytics.db.query(
+            "SELECT section_id, page, title FROM sections WHERE section_id IN "
+            f"({', '.join('?' * len(ids))})",
+            ids,
+        ) if ids else []
+        sections = pd.DataFrame.from_records(
+            rows, columns=["section_id", "page", "title"], index="section_id"
+        )
+        return sections.reindex(hotspots.index).assign(saves=hotspots)
+
+    def _run(self):
+        if self.analytics.load(self.state_path):
+            logger.info("Analytics resumed from event %d", self.analytics.watermark)
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Analytics refresh failed")
+            self._stop.wait(self.interval)
+
+
+@st.cache_resource
+def get_analytics_job():
+    """The process-wide job maintaining the admin dashboard's aggregates."""
+    return AnalyticsJob(get_cohort_analytics())
@@ -0,0 +1,153 @@
+"""A process-wide cache of Q&A answers keyed on normalized questions.
+
+Questions are lower-cased and split into words (dropping punctuation and
+extra whitespace), filler words are dropped, and synonyms and plurals are
+folded, so "What's an ETF?" and "what are exchange traded funds" share one
+entry. Entries expire after a TTL, the least recently used entry is evicted
+past `max_entries`, and the whole cache is cleared when the model version
+changes.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.search import tokenize
+
+MAX_ENTRIES = 1024
+TTL = 3600.0
+
+FILLER_WORDS = {"a", "an", "the", "please", "exactly", "actually", "really"}
+
+# Phrase -> canonical phrase, applied to whole words, longest phrase first
+SYNONYMS = {
+    "what s": "what is",
+    "whats": "what is",
+    "what are": "what is",
+    "meaning of": "what is",
+    "define": "what is",
+    "explain": "what is",
+    "tell me about": "what is",
+    "exchange traded fund": "etf",
+    "exchange traded funds": "etf",
+    "etfs": "etf",
+    "nifty50": "nifty 50",
+    "nifty fifty": "nifty 50",
+    "s&p500": "s&p 500",
+    "initial public offering": "ipo",
+    "initial public offerings": "ipo",
+    "ipos": "ipo",
+    "p e": "pe ratio",
+    "p e ratio": "pe ratio",
+    "price to earnings": "pe ratio",
+    "price to earnings ratio": "pe ratio",
+    "systematic investment plan": "sip",
+    "sips": "sip",
+    "mutual funds": "mutual fund",
+    "shares": "share",
+    "indices": "index",
+    "indexes": "index",
+}
+_PHRASES = {tuple(phrase.split()): tuple(canonical.split()) for phrase, canonical in SYNONYMS.items()}
+_LONGEST_PHRASE = max(len(phrase) for phrase in _PHRASES)
+
+
+def normalize_question(question):
+    """The cache key for a question: canonical words joined by spaces."""
+    words = [word for word in tokenize(question) if word not in FILLER_WORDS]
+    folded = []
+    position = 0
+    while position < len(words):
+        for length in range(min(_LONGEST_PHRASE, len(words) - position), 0, -1):
+            canonical = _PHRASES.get(tuple(words[position:position + length]))
+            if canonical is not None:
+                folded.extend(canonical)
+                position += length
+                break
+        else:
+            folded.append(words[position])
+            position += 1
+    return " ".join(folded)
+
+
+class AnswerCache:
+    """A thread-safe LRU cache of answers with a TTL and hit-rate counters.
+
+    Every lookup passes the current model version; answers cached under an
+    older version are all dropped the first time a new version is seen.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # key -> (answer, expires at)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key, version, default=None):
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, answer, version):
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (answer, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self.version = version
+
+
+@st.cache_resource
+def get_answer_cache():
+    return AnswerCache()
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+
+FIELDS = ["id", "page", "title", "content", "timestamp"]
+
+
+def iter_markdown(session):
+    """Yield a Markdown study guide, one chunk per heading or bookmark."""
+    yield "# My Stock Market Learning Bookmarks\n\n"
+    for page, page_bookmarks in session.by_page().items():
+        yield f"## {page}\n\n"
+        for bookmark_id in page_bookmarks:
+            bookmark = session.get(bookmark_id)
+            yield f"### {bookmark['title']}\n{bookmark['content']}\n\n"
+
+
+def iter_json(bookmarks):
+    """Yield a JSON array with one bookmark object per line."""
+    yield "[\n"
+    separator = ""
+    for bookmark in bookmarks:
+        yield separator + json.dumps({field: bookmark.get(field) for field in FIELDS}, ensure_ascii=False)
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def iter_csv(bookmarks):
+    """Yield CSV rows (with a header row), one chunk per row."""
+    line = io.StringIO()
+    writer = csv.writer(line)
+    for row in _csv_rows(bookmarks):
+        writer.writerow(row)
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+
+
+def _csv_rows(bookmarks):
+    yield FIELDS
+    for bookmark in bookmarks:
+        yield [bookmark.get(field, "") for field in FIELDS]
+
+
+# label -> (chunk generator over a BookmarkSession, file extension, MIME type)
+EXPORT_FORMATS = {
+    "Markdown": (iter_markdown, "md", "text/markdown"),
+    "JSON": (iter_json, "json", "application/json"),
+    "CSV": (iter_csv, "csv", "text/csv"),
+}
+
+
+def export_bookmarks(session, export_format):
+    """Write a whole export into one buffer and return it as UTF-8 bytes."""
+    chunks, _, _ = EXPORT_FORMATS[export_format]
+    buffer = io.StringIO()
+    buffer.writelines(chunks(session))
+    return buffer.getvalue().encode("utf-8")
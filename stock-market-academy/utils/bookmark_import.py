@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+MAX_LENGTHS = {"page": 100, "title": 200, "content": 20000}
+# Saved times as the app writes them, and as SQLite's CURRENT_TIMESTAMP does
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S")
+MAX_TIMESTAMP_LENGTH = 19
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_records(stream):
+    """Yield objects from a JSON array without loading the whole file.
+
+    Reads the text in chunks and decodes one array element at a time, so it
+    accepts both our one-object-per-line exports and pretty-printed files.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        buffer += chunk
+        position = 0
+        while True:
+            # Skip whitespace, separators and the opening bracket
+            while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+                if buffer[position] == "[":
+                    started = True
+                position += 1
+            if position >= len(buffer):
+                break
+            if not started:
+                raise ValueError("expected a JSON array of bookmarks")
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise
+                break  # element continues in the next chunk
+            yield record
+            position = end
+        buffer = buffer[position:]
+        if not chunk:
+            return
+
+
+def iter_csv_records(stream):
+    yield from csv.DictReader(stream)
+
+
+def iter_records(uploaded_file):
+    """Yield raw records from an uploaded JSON or CSV bookmark export."""
+    stream = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+    if uploaded_file.name.lower().endswith(".csv"):
+        yield from iter_csv_records(stream)
+    else:
+        yield from iter_json_records(stream)
+
+
+def validate_record(record):
+    """Return (page, title, content, timestamp) or None if the record is invalid.
+
+    A missing or malformed timestamp is dropped rather than the record.
+    """
+    if not isinstance(record, dict):
+        return None
+    values = []
+    for field, max_length in MAX_LENGTHS.items():
+        value = record.get(field)
+        if not isinstance(value, str) or not value.strip() or len(value) > max_length:
+            return None
+        values.append(value.strip())
+    values.append(parse_timestamp(record.get("timestamp")))
+    return tuple(values)
+
+
+def parse_timestamp(value):
+    """The saved time if it is one the app writes, else None (use the import time)."""
+    if not isinstance(value, str) or len(value.strip()) > MAX_TIMESTAMP_LENGTH:
+        return None
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            datetime.strptime(value.strip(), timestamp_format)
+        except ValueError:
+            continue
+        return value.strip()
+    return None
+
+
+def import_bookmarks(session, uploaded_file):
+    """Validate and add every bookmark in an upload in one batch.
+
+    Returns (imported, duplicates, invalid) counts.
+    """
+    valid = []
+    invalid = 0
+    for record in iter_records(uploaded_file):
+        bookmark = validate_record(record)
+        if bookmark is None:
+            invalid += 1
+        else:
+            valid.append(bookmark)
+    imported = session.add_many(valid)
+    return imported, len(valid) - imported, invalid
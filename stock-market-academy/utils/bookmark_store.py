@@ -0,0 +1,362 @@
+import sys
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import streamlit as st
+
+from utils.content_data import get_lesson_sections, section_id
+from utils.database import get_database
+from utils.events import (
+    BOOKMARK_ADDED, BOOKMARK_REMOVED, BOOKMARKS_CLEARED, get_event_buffer, make_event,
+)
+from utils.identity import get_user_id
+from utils.search import TextIndex
+
+Section = namedtuple("Section", ["id", "page", "title", "content"])
+
+_INSERT_SECTION = (
+    "INSERT OR IGNORE INTO sections (section_id, page, title, content) VALUES (?, ?, ?, ?)"
+)
+_REFRESH_SECTION = (
+    "UPDATE sections SET content = ?, updated_at = CURRENT_TIMESTAMP "
+    "WHERE section_id = ? AND content != ?"
+)
+
+
+class ContentTable:
+    """Process-wide, interned lesson sections shared by every session.
+
+    Each section is held once no matter how many users bookmark it, and is
+    loaded from the `sections` table the first time it is needed. Stored
+    text is never replaced by whoever bookmarks a section next; only
+    `refresh`, fed from the lesson pages themselves, updates it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def intern(self, page, title, content):
+        """The shared section for `page` and `title`, created from `content` if new.
+
+        A new section is only held in memory; the caller writes it with
+        the bookmark that refers to it.
+        """
+        key = section_id(page, title)
+        section = self.get(key)
+        if section is None:
+            with self._lock:
+                section = self._sections.setdefault(
+                    key, Section(key, sys.intern(page), sys.intern(title), content)
+                )
+        return section
+
+    def refresh(self, sections):
+        """Bring stored sections up to date with the lesson pages' current text."""
+        sections = list(sections)
+        with self.db.transaction() as conn:
+            conn.executemany(
+                _REFRESH_SECTION,
+                [(section["content"], section["section_id"], section["content"]) for section in sections],
+            )
+        with self._lock:
+            for section in sections:
+                cached = self._sections.get(section["section_id"])
+                if cached is not None:
+                    self._sections[cached.id] = cached._replace(content=section["content"])
+
+    def get(self, key):
+        section = self._sections.get(key)
+        if section is None:
+            rows = self.db.query(
+                "SELECT section_id, page, title, content FROM sections WHERE section_id = ?",
+                (key,),
+            )
+            if rows:
+                self.remember(_to_section(row) for row in rows)
+                section = self._sections[key]
+        return section
+
+    def remember(self, sections):
+        """Cache sections already read or written by another query."""
+        with self._lock:
+            for section in sections:
+                if section.id not in self._sections:
+                    self._sections[section.id] = section._replace(
+                        page=sys.intern(section.page), title=sys.intern(section.title)
+                    )
+
+
+def _to_section(row):
+    return Section(row["section_id"], row["page"], row["title"], row["content"])
+
+
+class BookmarkStore:
+    """Bookmarks persisted in SQLite as (user, section id) references."""
+
+    def __init__(self, db, content):
+        self.db = db
+        self.content = content
+
+    def load(self, user_id):
+        """Return {bookmark id: saved timestamp} in the order they were saved."""
+        rows = self.db.query(
+            "SELECT s.section_id, s.page, s.title, s.content, b.created_at "
+            "FROM bookmarks b JOIN sections s ON s.section_id = b.bookmark_id "
+            "WHERE b.user_id = ? ORDER BY b.rowid",
+            (user_id,),
+        )
+        self.content.remember(_to_section(row) for row in rows)
+        return {row["section_id"]: row["created_at"] for row in rows}
+
+    def apply(self, user_id, added=(), removed=(), cleared=False, sections=()):
+        """Write a batch of changes for one user in a single transaction.
+
+        `added` maps bookmark ids to their saved timestamps, and `sections`
+        are recorded first unless they are already stored.
+        """
+        with self.db.transaction() as conn:
+            conn.executemany(_INSERT_SECTION, sections)
+            if cleared:
+                conn.execute("DELETE FROM bookmarks WHERE user_id = ?", (user_id,))
+            conn.executemany(
+                "DELETE FROM bookmarks WHERE user_id = ? AND bookmark_id = ?",
+                [(user_id, bookmark_id) for bookmark_id in removed],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO bookmarks (user_id, bookmark_id, created_at) VALUES (?, ?, ?)",
+                [(user_id, bookmark_id, saved_at) for bookmark_id, saved_at in dict(added).items()],
+            )
+
+    def add_many(self, user_id, sections, added):
+        """Record sections and add bookmarks to them in a single transaction.
+
+        Sections that already exist keep their current text.
+        """
+        with self.db.transaction() as conn:
+            conn.executemany(_INSERT_SECTION, sections)
+            conn.executemany(
+                "INSERT OR IGNORE INTO bookmarks (user_id, bookmark_id, created_at) VALUES (?, ?, ?)",
+                [(user_id, bookmark_id, saved_at) for bookmark_id, saved_at in added.items()],
+            )
+
+
+class BookmarkSession:
+    """One user's bookmarks for the current browser session.
+
+    The session only holds section ids and saved timestamps, read from the
+    store on first use, alongside a per-page grouping that is updated on
+    every add and remove so summaries never regroup the whole collection.
+    Titles and text are resolved from the shared ContentTable when
+    rendered. A word index for `search()` is built on the first search and
+    then kept in step with adds and removes. Changes are queued and written
+    in one batch by `flush()` at the end of each rerun. With an event
+    buffer, each change is also recorded as a learner event.
+    """
+
+    def __init__(self, store, user_id, events=None):
+        self.store = store
+        self.content = store.content
+        self.user_id = user_id
+        self.events = events
+        self._bookmarks = None
+        self._by_page = None
+        self._index = None
+        # Bumped on every change so derived data (exports) can be cached
+        self.version = 0
+        self._added = {}
+        self._sections = {}
+        self._removed = set()
+        self._cleared = False
+
+    def _load(self):
+        self._bookmarks = self.store.load(self.user_id)
+        self._by_page = {}
+        for bookmark_id, saved_at in self._bookmarks.items():
+            page = self.content.get(bookmark_id).page
+            self._by_page.setdefault(page, {})[bookmark_id] = saved_at
+
+    @property
+    def bookmarks(self):
+        if self._bookmarks is None:
+            self._load()
+        return self._bookmarks
+
+    def __len__(self):
+        return len(self.bookmarks)
+
+    def __iter__(self):
+        """Iterate over resolved bookmark dicts, in the order they were saved."""
+        for bookmark_id in list(self.bookmarks):
+            yield self.get(bookmark_id)
+
+    def __contains__(self, bookmark_id):
+        return bookmark_id in self.bookmarks
+
+    def get(self, bookmark_id):
+        """Resolve a bookmark id to a dict with its current title and text."""
+        saved_at = self.bookmarks.get(bookmark_id)
+        if saved_at is None:
+            return None
+        section = self.content.get(bookmark_id)
+        return {
+            "id": bookmark_id,
+            "title": section.title,
+            "content": section.content,
+            "page": section.page,
+            "timestamp": saved_at,
+        }
+
+    def by_page(self):
+        """Bookmark ids grouped as {page: {id: saved timestamp}}, in first-saved order."""
+        if self._by_page is None:
+            self._load()
+        return self._by_page
+
+    def search(self, query):
+        """Return the ids of bookmarks whose title, text or page match `query`."""
+        if self._index is None:
+            self._index = TextIndex()
+            for bookmark_id in self.bookmarks:
+                self._index_bookmark(bookmark_id)
+        return self._index.search(query)
+
+    def _index_bookmark(self, bookmark_id):
+        section = self.content.get(bookmark_id)
+        self._index.add(bookmark_id, f"{section.title} {section.content} {section.page}")
+
+    def page_counts(self):
+        return {page: len(group) for page, group in self.by_page().items()}
+
+    def favorite_page(self):
+        """The page with the most bookmarks, or None if there are none."""
+        groups = self.by_page()
+        return max(groups, key=lambda page: len(groups[page])) if groups else None
+
+    def add(self, page, title, content):
+        """Add a bookmark; returns False if it was already saved."""
+        section = self.content.intern(page, title, content)
+        bookmark_id = section.id
+        if bookmark_id in self.bookmarks:
+            return False
+        saved_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.bookmarks[bookmark_id] = saved_at
+        self._by_page.setdefault(section.page, {})[bookmark_id] = saved_at
+        if self._index is not None:
+            self._index_bookmark(bookmark_id)
+        self._added[bookmark_id] = saved_at
+        self._sections[bookmark_id] = section
+        self._removed.discard(bookmark_id)
+        self.version += 1
+        self._record(BOOKMARK_ADDED, bookmark_id)
+        return True
+
+    def add_many(self, bookmarks):
+        """Add (page, title, content, timestamp) tuples in one transaction.
+
+        Bookmarks already saved, or repeated within the batch, are skipped
+        by id. Returns how many were added.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        sections = {}
+        added = {}
+        for page, title, content, saved_at in bookmarks:
+            bookmark_id = section_id(page, title)
+            if bookmark_id in self.bookmarks or bookmark_id in added:
+                continue
+            sections[bookmark_id] = Section(bookmark_id, page, title, content)
+            added[bookmark_id] = saved_at or now
+        if not added:
+            return 0
+
+        self.flush()
+        self.store.add_many(self.user_id, list(sections.values()), added)
+        for bookmark_id, saved_at in added.items():
+            self.bookmarks[bookmark_id] = saved_at
+            self._by_page.setdefault(sections[bookmark_id].page, {})[bookmark_id] = saved_at
+            if self._index is not None:
+                self._index_bookmark(bookmark_id)
+            self._record(BOOKMARK_ADDED, bookmark_id)
+        self.version += 1
+        return len(added)
+
+    def remove(self, bookmark_id):
+        """Remove a bookmark by id and return it (None if it wasn't saved)."""
+        removed = self.get(bookmark_id)
+        if removed is None:
+            return None
+        del self.bookmarks[bookmark_id]
+        group = self._by_page[removed["page"]]
+        del group[bookmark_id]
+        if not group:
+            del self._by_page[removed["page"]]
+        if self._index is not None:
+            self._index.remove(bookmark_id)
+        if self._added.pop(bookmark_id, None) is None:
+            self._removed.add(bookmark_id)
+        self._sections.pop(bookmark_id, None)
+        self.version += 1
+        self._record(BOOKMARK_REMOVED, bookmark_id)
+        return removed
+
+    def clear(self):
+        self._bookmarks = {}
+        self._by_page = {}
+        self._index = None
+        self._added = {}
+        self._sections = {}
+        self._removed = set()
+        self._cleared = True
+        self.version += 1
+        self._record(BOOKMARKS_CLEARED)
+
+    def _record(self, kind, bookmark_id=None):
+        if self.events is not None:
+            payload = {"bookmark_id": bookmark_id} if bookmark_id else {}
+            self.events.put(make_event(self.user_id, kind, **payload))
+
+    def flush(self):
+        """Write queued changes to the store."""
+        if self._added or self._removed or self._cleared:
+            self.store.apply(
+                self.user_id, self._added, self._removed, self._cleared, list(self._sections.values())
+            )
+            self._added = {}
+            self._sections = {}
+            self._removed = set()
+            self._cleared = False
+
+
+@st.cache_resource
+def get_bookmark_store():
+    db = get_database()
+    content = ContentTable(db)
+    content.refresh(get_lesson_sections())
+    return BookmarkStore(db, content)
+
+
+def get_bookmarks():
+    """Return the current user's BookmarkSession, creating it on first use."""
+    user_id = get_user_id()
+    session = st.session_state.get("bookmark_session")
+    if session is None or session.user_id != user_id:
+        session = BookmarkSession(get_bookmark_store(), user_id, get_event_buffer())
+        st.session_state.bookmark_session = session
+    # Writes queued by a rerun that was cut short (st.rerun, st.switch_page)
+    session.flush()
+    return session
+
+
+def flush_bookmarks():
+    if "bookmark_session" in st.session_state:
+        st.session_state.bookmark_session.flush()
+
+
+def add_to_bookmarks(page, title, content):
+    """Bookmark a section from `page` and tell the user what happened."""
+    if get_bookmarks().add(page, title, content):
+        st.success("Added to bookmarks! ⭐")
+    else:
+        st.info("Already in bookmarks!")
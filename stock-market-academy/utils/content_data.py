@@ -1,10 +1,96 @@
+import ast
+import hashlib
+import os
+import re
+
+import streamlit as st
+
+from utils.registry import MODULES
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Streamlit calls whose first string argument is lesson text, and those that label a section
+_TEXT_CALLS = {"markdown", "write", "info", "success", "warning", "error", "caption"}
+_HEADING_CALLS = {"header", "subheader", "expander"}
+_MIN_SECTION_LENGTH = 40
+
+_HEADING = re.compile(r"^\s*#{1,6}\s+(.*)$")
+_MARKUP = re.compile(r"<[^>]+>|[*_`]+")
+_LEADING_SYMBOLS = re.compile(r"^[^\w\"'(]+")
+
 def get_welcome_content():
     return "Welcome to your financial journey!"
 
+def _clean(text):
+    return _MARKUP.sub("", text).strip()
+
+def _heading(text):
+    return _LEADING_SYMBOLS.sub("", _clean(text)).strip(" :")
+
+def _lesson_strings(source):
+    """(is heading, text) for each literal string passed to a Streamlit call, in source order."""
+    calls = []
+    for node in ast.walk(ast.parse(source)):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+            continue
+        if not (isinstance(node.func.value, ast.Name) and node.func.value.id == "st"):
+            continue
+        name = node.func.attr
+        if name not in _TEXT_CALLS and name not in _HEADING_CALLS:
+            continue
+        if not node.args or not isinstance(node.args[0], ast.Constant) or not isinstance(node.args[0].value, str):
+            continue
+        calls.append((node.lineno, node.col_offset, name in _HEADING_CALLS, node.args[0].value))
+    return [(heading, text) for _, _, heading, text in sorted(calls)]
+
+def extract_sections(source, page):
+    """Split a lesson page's text into sections at its headings.
+
+    Returns dicts with the section's page label, heading, plain-text content
+    and section id; sections with almost no text are dropped.
+    """
+    sections = []
+    title, lines = None, []
+
+    def close():
+        content = " ".join(" ".join(lines).split())
+        if title and len(content) >= _MIN_SECTION_LENGTH:
+            sections.append({
+                "section_id": section_id(page, title),
+                "page": page,
+                "title": title,
+                "content": content,
+                "keywords": [],
+            })
+
+    for is_heading, text in _lesson_strings(source):
+        if is_heading:
+            close()
+            title, lines = _heading(text), []
+            continue
+        for line in text.splitlines():
+            match = _HEADING.match(line)
+            if match:
+                close()
+                title, lines = _heading(match.group(1)), []
+            elif line.strip() and line.strip() != "---":
+                lines.append(_clean(line))
+    close()
+    return sections
+
 def get_all_content():
-    # This is a basic example. Replace with your actual content.
-    return {
-        "What is a Stock?": "A stock is a type of investment that represents partial ownership in a company.",
-        "Why Companies Go Public": "Companies go public to raise money for growth and expansion.",
-        # Add more topics and content as needed
-    }
+    """Every lesson page's sections, extracted from the page sources."""
+    sections = []
+    for module in MODULES:
+        with open(os.path.join(APP_ROOT, module.path), encoding="utf-8") as f:
+            sections.extend(extract_sections(f.read(), module.title))
+    return sections
+
+@st.cache_resource
+def get_lesson_sections():
+    """`get_all_content()`, extracted once per process and shared by every session."""
+    return tuple(get_all_content())
+
+def section_id(page, title):
+    """Stable id for a lesson section, derived from its page and title."""
+    return hashlib.sha1(f"{page}\x1f{title}".encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,95 @@
+import random
+
+# Lesson pages a synthetic section can belong to (same labels the pages use)
+LESSON_PAGES = [
+    "What is a Stock",
+    "Why Companies Go Public",
+    "Where to Buy Stocks",
+    "Stock Exchanges",
+    "Stock Pricing",
+    "Market Analogies",
+    "Market Indices",
+]
+
+# Vocabulary that appears across the real lessons
+TOPICS = [
+    "stock", "share", "dividend", "IPO", "ETF", "index", "Nifty 50", "Sensex",
+    "S&P 500", "NASDAQ", "NYSE", "BSE", "NSE", "broker", "demat account",
+    "primary market", "secondary market", "supply demand", "volatility",
+    "blue-chip", "growth stock", "market cap", "P/E ratio", "compound interest",
+    "SIP", "mutual fund", "portfolio", "diversification", "bull market",
+    "bear market", "earnings", "valuation", "liquidity", "order book",
+]
+
+ANALOGIES = [
+    "coffee vs matcha", "beauty basket", "designer handbag", "pizza shop",
+    "shopping mall", "classroom average", "seesaw", "house buying",
+]
+
+TITLE_TEMPLATES = [
+    "Understanding {topic}",
+    "What is {topic}?",
+    "{topic} Explained",
+    "The {analogy} Analogy for {topic}",
+    "{topic} - Key Takeaways",
+    "How {topic} Affects Your Investments",
+    "{topic} vs {other}",
+]
+
+SENTENCE_TEMPLATES = [
+    "A {topic} is one of the first ideas every new investor should understand.",
+    "Think of {topic} like the {analogy}: small pieces add up to the whole picture.",
+    "When {topic} changes, prices on the {exchange} can move quickly.",
+    "Many beginners confuse {topic} with {other}, but they work differently.",
+    "Over long horizons, {topic} tends to reward patience more than timing.",
+    "Investing ₹{amount} every month builds familiarity with {topic} over time.",
+    "The {analogy} shows why {topic} matters for a diversified portfolio.",
+    "Regulators watch {topic} closely to keep the {exchange} fair for everyone.",
+]
+
+EXCHANGES = ["NYSE", "NASDAQ", "BSE", "NSE", "LSE"]
+
+
+def _section(rng):
+    topic = rng.choice(TOPICS)
+    other = rng.choice(TOPICS)
+    analogy = rng.choice(ANALOGIES)
+    fields = {
+        "topic": topic,
+        "other": other,
+        "analogy": analogy,
+        "exchange": rng.choice(EXCHANGES),
+        "amount": rng.choice([500, 1000, 2000, 5000, 10000]),
+    }
+    title = rng.choice(TITLE_TEMPLATES).format(**fields)
+    sentences = []
+    for _ in range(rng.randint(3, 12)):
+        fields["topic"] = rng.choice([topic, topic, rng.choice(TOPICS)])
+        fields["other"] = rng.choice(TOPICS)
+        sentences.append(rng.choice(SENTENCE_TEMPLATES).format(**fields))
+    keywords = sorted({topic.lower(), other.lower(), analogy.split()[0]})
+    return {
+        "title": title,
+        "content": " ".join(sentences),
+        "keywords": keywords,
+        "page": rng.choice(LESSON_PAGES),
+    }
+
+
+def generate_corpus(size, seed=0):
+    """Generate `size` synthetic lesson sections in the content schema."""
+    rng = random.Random(seed)
+    return [_section(rng) for _ in range(size)]
+
+
+def generate_queries(count, seed=0, miss_rate=0.1):
+    """Generate search queries, including a share that match nothing."""
+    rng = random.Random(seed + 1)
+    vocabulary = TOPICS + ANALOGIES
+    queries = []
+    for _ in range(count):
+        if rng.random() < miss_rate:
+            queries.append("zz" + "".join(rng.choice("qxjkv") for _ in range(6)))
+        else:
+            queries.append(rng.choice(vocabulary))
+    return queries
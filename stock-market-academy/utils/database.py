@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import streamlit as st
+
+from utils.content_data import section_id
+
+DB_PATH = os.environ.get(
+    "ACADEMY_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "academy.db"),
+)
+
+# Schema migrations, applied in order. PRAGMA user_version records how many ran.
+MIGRATIONS = [
+    """
+    CREATE TABLE bookmarks (
+        user_id TEXT NOT NULL,
+        page TEXT NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (user_id, page, title)
+    );
+    """,
+    """
+    ALTER TABLE bookmarks ADD COLUMN bookmark_id TEXT;
+    UPDATE bookmarks SET bookmark_id = section_id(page, title);
+    CREATE UNIQUE INDEX bookmarks_user_bookmark ON bookmarks (user_id, bookmark_id);
+    """,
+    # Lesson text lives once in `sections`; bookmarks only reference it
+    """
+    CREATE TABLE sections (
+        section_id TEXT PRIMARY KEY,
+        page TEXT NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX sections_page ON sections (page);
+    INSERT OR IGNORE INTO sections (section_id, page, title, content)
+        SELECT bookmark_id, page, title, content FROM bookmarks ORDER BY rowid DESC;
+    CREATE TABLE bookmark_refs (
+        user_id TEXT NOT NULL,
+        bookmark_id TEXT NOT NULL REFERENCES sections (section_id),
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (user_id, bookmark_id)
+    );
+    INSERT INTO bookmark_refs (user_id, bookmark_id, created_at)
+        SELECT user_id, bookmark_id, created_at FROM bookmarks ORDER BY rowid;
+    DROP TABLE bookmarks;
+    ALTER TABLE bookmark_refs RENAME TO bookmarks;
+    """,
+    """
+    CREATE TABLE progress (
+        user_id TEXT PRIMARY KEY,
+        completed_mask INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE events (
+        id INTEGER PRIMARY KEY,
+        event_id TEXT NOT NULL UNIQUE,
+        user_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        module TEXT,
+        payload TEXT NOT NULL DEFAULT '{}',
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX events_user_kind ON events (user_id, kind);
+    """,
+    """
+    CREATE TABLE reviews (
+        user_id TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        page TEXT NOT NULL,
+        title TEXT NOT NULL,
+        easiness REAL NOT NULL DEFAULT 2.5,
+        interval_days REAL NOT NULL DEFAULT 0,
+        repetitions INTEGER NOT NULL DEFAULT 0,
+        reviewed_at REAL,
+        due_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (user_id, item_id)
+    );
+    CREATE INDEX reviews_user_updated ON reviews (user_id, updated_at);
+    """,
+    """
+    CREATE TABLE item_parameters (
+        item_id TEXT PRIMARY KEY,
+        discrimination REAL NOT NULL,
+        difficulty REAL NOT NULL,
+        responses INTEGER NOT NULL,
+        fitted_at REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE question_stats (
+        item_id TEXT PRIMARY KEY,
+        module TEXT NOT NULL,
+        question TEXT NOT NULL,
+        attempts INTEGER NOT NULL,
+        p_value REAL NOT NULL,
+        discrimination REAL,
+        option_counts TEXT NOT NULL,
+        computed_at REAL NOT NULL
+    );
+    """,
+]
+
+
+class Database:
+    """A single SQLite connection in WAL mode shared by all sessions."""
+
+    def __init__(self, path=DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.create_function("section_id", 2, section_id, deterministic=True)
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.migrate()
+
+    def migrate(self):
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                for statement in script.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements atomically, serialised across threads."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+
+@st.cache_resource
+def get_database():
+    return Database()
@@ -0,0 +1,143 @@
+import atexit
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Collect events in memory and hand them to `sink` in batches.
+
+    A background thread flushes when `max_batch` events are waiting or the
+    oldest has waited `max_delay` seconds, and once more at interpreter
+    exit. Events are only dropped from the buffer after `sink(batch)`
+    returns, so a failed write is retried: delivery is at-least-once and
+    sinks should tolerate seeing an event twice.
+
+    After `max_retries` failed attempts the batch is tried one event at a
+    time, and events the sink still rejects are dead-lettered: logged, and
+    appended as JSON lines to `dead_letter_path` when one is given. Events
+    put while `max_pending` are already waiting are dead-lettered straight
+    away, so a stuck sink can't grow the buffer without bound.
+    """
+
+    def __init__(self, sink, max_batch=100, max_delay=2.0, retry_delay=1.0,
+                 max_retries=10, max_pending=10000, dead_letter_path=None):
+        self.sink = sink
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self.dead_letter_path = dead_letter_path
+        self.dead_lettered = 0
+        self._failures = 0
+        self._events = []
+        self._oldest = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dead_letter_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __len__(self):
+        with self._condition:
+            return len(self._events)
+
+    def put(self, event):
+        """Queue an event; never waits on the sink."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("buffer is closed")
+            full = len(self._events) >= self.max_pending
+            if not full and not self._events:
+                self._oldest = time.monotonic()
+            if not full:
+                self._events.append(event)
+                # Wake the writer to start the delay timer, or to write a full batch
+                if len(self._events) == 1 or len(self._events) >= self.max_batch:
+                    self._condition.notify()
+        if full:
+            logger.warning("Write-behind buffer is full; dead-lettering an event")
+            self._dead_letter([event])
+
+    def flush(self):
+        """Write everything queued so far; returns False if the sink failed."""
+        with self._write_lock:
+            while True:
+                with self._condition:
+                    batch = self._events[:self.max_batch]
+                if not batch:
+                    return True
+                try:
+                    self.sink(batch)
+                except Exception:
+                    logger.exception("Write-behind flush of %d events failed", len(batch))
+                    self._failures += 1
+                    if self._failures < self.max_retries:
+                        return False
+                    self._deliver_singly(batch)
+                self._failures = 0
+                with self._condition:
+                    del self._events[:len(batch)]
+                    self._oldest = time.monotonic() if self._events else None
+
+    def close(self):
+        """Stop the background thread and write what is left."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=5)
+        if not self.flush():
+            with self._condition:
+                remaining, self._events = self._events, []
+            self._dead_letter(remaining)
+
+    def _deliver_singly(self, batch):
+        """Give up on a batch as a whole: write what the sink accepts alone."""
+        rejected = []
+        for event in batch:
+            try:
+                self.sink([event])
+            except Exception:
+                rejected.append(event)
+        if rejected:
+            self._dead_letter(rejected)
+
+    def _dead_letter(self, events):
+        if not events:
+            return
+        self.dead_lettered += len(events)
+        logger.error("Dead-lettering %d event(s) the sink would not accept", len(events))
+        if self.dead_letter_path is None:
+            return
+        try:
+            with self._dead_letter_lock, open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            logger.exception("Could not write dead letters to %s", self.dead_letter_path)
+
+    def _due(self):
+        if not self._events:
+            return False
+        return len(self._events) >= self.max_batch or time.monotonic() - self._oldest >= self.max_delay
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._due():
+                    timeout = None
+                    if self._events:
+                        timeout = max(0.0, self.max_delay - (time.monotonic() - self._oldest))
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            if not self.flush():
+                time.sleep(self.retry_delay)
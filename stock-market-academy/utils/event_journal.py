@@ -0,0 +1,204 @@
+"""Append-only learner event journal with per-user snapshots.
+
+Each user has numbered log generations (`<user>.<gen>.log`) holding
+length-prefixed records, plus at most one snapshot (`<user>.snap`) of their
+state folded over every generation up to the one it names. Rebuilding a
+user's state reads the snapshot and replays only the newer generations.
+
+Every record is a 4-byte big-endian payload length, a 4-byte CRC32 of the
+payload, then the payload as UTF-8 JSON. A torn or corrupt record ends the
+log, which is what a crash in the middle of an append leaves behind.
+
+The write-behind buffer may append a batch again after a failed write, so
+replay skips event ids it has already folded. Snapshots keep the ids of
+the last `snapshot_every` events they cover to catch a retry that lands
+after compaction.
+
+SQLite stays the source of truth for progress and bookmarks; the app only
+restores recent searches from here, and the rest is an audit trail.
+"""
+import glob
+import json
+import os
+import struct
+import threading
+import zlib
+from collections import deque
+
+HEADER = struct.Struct(">II")
+SNAPSHOT_EVERY = 200
+
+
+def encode_record(event):
+    payload = json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path):
+    """Yield decoded events from a log file, stopping at the first bad record."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, checksum = HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            yield json.loads(payload)
+
+
+def empty_state():
+    return {"completed": [], "quiz": {}, "bookmarks": [], "recent_searches": []}
+
+
+def apply_event(state, event):
+    """Fold one event into a user's state (in place) and return it."""
+    kind = event["kind"]
+    module = event.get("module")
+    payload = event.get("payload", {})
+    if kind == "completion":
+        if module not in state["completed"]:
+            state["completed"].append(module)
+    elif kind == "quiz_attempt":
+        quiz = state["quiz"].setdefault(module, {"attempts": 0, "best": 0, "last": 0})
+        quiz["attempts"] += 1
+        quiz["best"] = max(quiz["best"], payload["score"])
+        quiz["last"] = payload["score"]
+    elif kind == "bookmark_added":
+        if payload["bookmark_id"] not in state["bookmarks"]:
+            state["bookmarks"].append(payload["bookmark_id"])
+    elif kind == "bookmark_removed":
+        if payload["bookmark_id"] in state["bookmarks"]:
+            state["bookmarks"].remove(payload["bookmark_id"])
+    elif kind == "bookmarks_cleared":
+        state["bookmarks"] = []
+    elif kind == "search":
+        searches = [q for q in state["recent_searches"] if q != payload["query"]]
+        state["recent_searches"] = ([payload["query"]] + searches)[:5]
+    return state
+
+
+class EventJournal:
+    def __init__(self, directory, snapshot_every=SNAPSHOT_EVERY):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._user_locks = {}
+        self._generation = {}  # user -> generation appends go to
+        self._unsnapshotted = {}  # user -> records appended since the last snapshot
+
+    def _user_lock(self, user_id):
+        with self._lock:
+            return self._user_locks.setdefault(user_id, threading.Lock())
+
+    def _log_path(self, user_id, generation):
+        return os.path.join(self.directory, f"{user_id}.{generation}.log")
+
+    def _snapshot_path(self, user_id):
+        return os.path.join(self.directory, f"{user_id}.snap")
+
+    def _generations(self, user_id):
+        prefix = os.path.join(self.directory, f"{user_id}.")
+        generations = []
+        for path in glob.glob(glob.escape(prefix) + "*.log"):
+            number = path[len(prefix):-len(".log")]
+            if number.isdigit():
+                generations.append(int(number))
+        return sorted(generations)
+
+    def _read_snapshot(self, user_id):
+        try:
+            with open(self._snapshot_path(user_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"generation": -1, "state": empty_state(), "recent_ids": []}
+
+    def _replay(self, user_id, snapshot, generations):
+        """Fold newer generations into the snapshot's state, once per event id.
+
+        Returns the state, the ids folded most recently, and how many
+        events were replayed.
+        """
+        state = snapshot["state"]
+        recent = deque(snapshot.get("recent_ids", []), maxlen=self.snapshot_every)
+        seen = set(recent)
+        replayed = 0
+        for generation in generations:
+            if generation > snapshot["generation"]:
+                for event in read_records(self._log_path(user_id, generation)):
+                    event_id = event.get("event_id")
+                    if event_id is not None:
+                        if event_id in seen:
+                            continue
+                        seen.add(event_id)
+                        recent.append(event_id)
+                    apply_event(state, event)
+                    replayed += 1
+        return state, list(recent), replayed
+
+    def append(self, events):
+        """Append a batch of events to each user's current log generation."""
+        by_user = {}
+        for event in events:
+            by_user.setdefault(event["user_id"], []).append(event)
+
+        for user_id, user_events in by_user.items():
+            with self._user_lock(user_id):
+                generation = self._generation.get(user_id)
+                if generation is None:
+                    # Never append after a log this process didn't write: it
+                    # may end in a torn record that would hide what follows
+                    generations = self._generations(user_id)
+                    generation = generations[-1] + 1 if generations else 0
+                    self._generation[user_id] = generation
+                with open(self._log_path(user_id, generation), "ab") as f:
+                    f.write(b"".join(encode_record(event) for event in user_events))
+                count = self._unsnapshotted.get(user_id, 0) + len(user_events)
+                self._unsnapshotted[user_id] = count
+            if count >= self.snapshot_every:
+                self.snapshot(user_id)
+
+    def load_state(self, user_id):
+        """Rebuild a user's state from their snapshot and newer log generations."""
+        with self._user_lock(user_id):
+            snapshot = self._read_snapshot(user_id)
+            state, _, replayed = self._replay(user_id, snapshot, self._generations(user_id))
+            self._unsnapshotted[user_id] = replayed
+        return state
+
+    def snapshot(self, user_id):
+        """Fold the user's logs into a new snapshot and delete the folded logs.
+
+        New appends switch to a fresh generation first, so the generations
+        being folded are no longer written to. Each step leaves a state that
+        `load_state` reads correctly if the process dies part way through.
+        """
+        with self._user_lock(user_id):
+            generations = self._generations(user_id)
+            if not generations:
+                return
+            folded = generations[-1]
+            self._generation[user_id] = folded + 1
+            self._unsnapshotted[user_id] = 0
+
+            state, recent_ids, _ = self._replay(user_id, self._read_snapshot(user_id), generations)
+
+            temporary = self._snapshot_path(user_id) + ".tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"generation": folded, "state": state, "recent_ids": recent_ids},
+                    f, ensure_ascii=False,
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self._snapshot_path(user_id))
+
+            # Compaction: the snapshot now covers these generations
+            for generation in generations:
+                os.remove(self._log_path(user_id, generation))
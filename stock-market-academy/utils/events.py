@@ -0,0 +1,115 @@
+import json
+import os
+import time
+import uuid
+
+import streamlit as st
+
+from utils.database import DB_PATH, get_database
+from utils.event_buffer import WriteBehindBuffer
+from utils.event_journal import EventJournal
+from utils.registry import BY_KEY
+from utils.review_scheduler import LAPSE_SQL, lapse_rows
+
+# Event kinds
+COMPLETION = "completion"
+QUIZ_ATTEMPT = "quiz_attempt"
+BOOKMARK_ADDED = "bookmark_added"
+BOOKMARK_REMOVED = "bookmark_removed"
+BOOKMARKS_CLEARED = "bookmarks_cleared"
+SEARCH = "search"
+ADAPTIVE_ANSWER = "adaptive_answer"
+
+JOURNAL_DIR = os.environ.get(
+    "ACADEMY_JOURNAL_DIR", os.path.join(os.path.dirname(DB_PATH), "journal")
+)
+DEAD_LETTER_PATH = os.path.join(os.path.dirname(DB_PATH), "dead_letter.jsonl")
+
+
+def make_event(user_id, kind, module=None, **payload):
+    return {
+        "event_id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "kind": kind,
+        "module": module,
+        "payload": payload,
+        "created_at": time.time(),
+    }
+
+
+def write_events(db, batch):
+    """Store a batch of events and apply them to progress and reviews, atomically.
+
+    Safe to replay: events are deduplicated by event_id, completions are
+    OR-ed into the stored mask, and missed questions are only lapsed for
+    quiz attempts the events table doesn't have yet.
+    """
+    completions = {}
+    for event in batch:
+        if event["kind"] == COMPLETION:
+            bit = 1 << BY_KEY[event["module"]].position
+            completions[event["user_id"]] = completions.get(event["user_id"], 0) | bit
+
+    with db.transaction() as conn:
+        attempts = {e["event_id"]: e for e in batch if e["kind"] == QUIZ_ATTEMPT}
+        if attempts:
+            placeholders = ", ".join("?" * len(attempts))
+            for row in conn.execute(
+                f"SELECT event_id FROM events WHERE event_id IN ({placeholders})", list(attempts)
+            ):
+                del attempts[row[0]]
+        lapses = [
+            row
+            for event in attempts.values()
+            for row in lapse_rows(event, BY_KEY[event["module"]].title)
+        ]
+        conn.executemany(
+            "INSERT OR IGNORE INTO events (event_id, user_id, kind, module, payload, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (e["event_id"], e["user_id"], e["kind"], e["module"],
+                 json.dumps(e["payload"], ensure_ascii=False), e["created_at"])
+                for e in batch
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO progress (user_id, completed_mask) VALUES (?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET "
+            "completed_mask = completed_mask | excluded.completed_mask, "
+            "updated_at = CURRENT_TIMESTAMP",
+            list(completions.items()),
+        )
+        conn.executemany(LAPSE_SQL, lapses)
+
+
+@st.cache_resource
+def get_event_journal():
+    return EventJournal(JOURNAL_DIR)
+
+
+@st.cache_resource
+def get_event_buffer():
+    """The process-wide write-behind buffer for learner events.
+
+    Each batch goes to the database and then to the per-user journal. If the
+    journal write fails the batch is retried and the database ignores the
+    events it already has. Events that keep failing are appended to
+    `data/dead_letter.jsonl` instead of blocking the events behind them.
+    """
+    db = get_database()
+    journal = get_event_journal()
+
+    def sink(batch):
+        write_events(db, batch)
+        journal.append(batch)
+
+    return WriteBehindBuffer(sink, dead_letter_path=DEAD_LETTER_PATH)
+
+
+def load_learner_state(user_id):
+    """The user's state rebuilt from their journal snapshot and recent events.
+
+    Only recent searches are read from it; progress and bookmarks load from
+    SQLite.
+    """
+    return get_event_journal().load_state(user_id)
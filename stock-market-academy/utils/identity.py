@@ -0,0 +1,44 @@
+import hmac
+import os
+import re
+import uuid
+
+import streamlit as st
+
+_USER_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# The admin dashboard is disabled unless this environment variable is set
+ADMIN_TOKEN_ENV = "ACADEMY_ADMIN_TOKEN"
+
+
+def get_user_id():
+    """Return a stable id for this browser, kept in the `uid` query parameter.
+
+    The id survives page refreshes because it lives in the URL, and is
+    re-applied after page switches because it is also kept in session state.
+    """
+    if "user_id" not in st.session_state:
+        user_id = st.query_params.get("uid", "")
+        if not _USER_ID_PATTERN.match(user_id):
+            user_id = uuid.uuid4().hex
+        st.session_state.user_id = user_id
+
+    if st.query_params.get("uid") != st.session_state.user_id:
+        st.query_params["uid"] = st.session_state.user_id
+    return st.session_state.user_id
+
+
+def admin_enabled():
+    return bool(os.environ.get(ADMIN_TOKEN_ENV))
+
+
+def sign_in_admin(token):
+    """Mark this session as an admin if `token` matches the configured one."""
+    expected = os.environ.get(ADMIN_TOKEN_ENV, "")
+    if expected and hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8")):
+        st.session_state.is_admin = True
+    return is_admin()
+
+
+def is_admin():
+    return admin_enabled() and st.session_state.get("is_admin", False)
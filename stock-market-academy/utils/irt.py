@@ -0,0 +1,254 @@
+"""Adaptive practice with a two-parameter logistic (2PL) IRT model.
+
+The chance that a learner of ability theta answers item j correctly is
+1 / (1 + exp(-a_j (theta - b_j))), where a_j is the item's discrimination
+and b_j its difficulty. Practice picks the unanswered item with the most
+Fisher information at the current ability estimate, and re-estimates
+ability after each answer with a few Newton steps.
+
+Item parameters are fit offline from recorded quiz answers; run
+`python -m utils.irt` to refit them. Items without a fit use a = 1, b = 0.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.database import Database, get_database
+from utils.events import ADAPTIVE_ANSWER, QUIZ_ATTEMPT
+from utils.identity import get_user_id
+from utils.quiz_engine import QUIZ_BANK, selection
+from utils.registry import BY_KEY
+from utils.review_scheduler import question_id
+
+# Priors: ability ~ N(0, 1), log discrimination ~ N(0, 0.5^2), difficulty ~ N(0, 2^2)
+ABILITY_SD = 1.0
+LOG_DISCRIMINATION_SD = 0.5
+DIFFICULTY_SD = 2.0
+DISCRIMINATION_RANGE = (0.2, 4.0)
+DIFFICULTY_RANGE = (-4.0, 4.0)
+NEWTON_STEPS = 4
+ABILITY_NODES = 41
+
+
+def p_correct(theta, a, b):
+    return 1 / (1 + np.exp(-a * (theta - b)))
+
+
+def information(theta, a, b):
+    p = p_correct(theta, a, b)
+    return a * a * p * (1 - p)
+
+
+def estimate_ability(a, b, correct, theta=0.0, steps=NEWTON_STEPS):
+    """MAP ability for answers to items (a, b), by Newton's method from `theta`.
+
+    Returns (theta, standard error).
+    """
+    for _ in range(steps):
+        p = p_correct(theta, a, b)
+        gradient = np.sum(a * (correct - p)) - theta / ABILITY_SD ** 2
+        curvature = np.sum(a * a * p * (1 - p)) + 1 / ABILITY_SD ** 2
+        theta += gradient / curvature
+    p = p_correct(theta, a, b)
+    curvature = np.sum(a * a * p * (1 - p)) + 1 / ABILITY_SD ** 2
+    return float(theta), float(1 / np.sqrt(curvature))
+
+
+class ItemBank:
+    """Every lesson quiz question as one bank, with 2PL parameters as arrays."""
+
+    def __init__(self, parameters=None):
+        parameters = parameters or {}
+        self.ids = []
+        self.items = []  # (module, quiz, question row)
+        for module_key, quiz in QUIZ_BANK.items():
+            page = BY_KEY[module_key].title
+            for row, question in enumerate(quiz.questions):
+                self.ids.append(question_id(page, question.review))
+                self.items.append((BY_KEY[module_key], quiz, row))
+        self.position = {item_id: index for index, item_id in enumerate(self.ids)}
+        default = (1.0, 0.0)
+        self.discrimination = np.array([parameters.get(i, default)[0] for i in self.ids])
+        self.difficulty = np.array([parameters.get(i, default)[1] for i in self.ids])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def question(self, index):
+        module, quiz, row = self.items[index]
+        return module, quiz.questions[row]
+
+    def is_correct(self, index, response):
+        _, quiz, row = self.items[index]
+        key = quiz.answer_key[row]
+        return bool(np.array_equal(selection(quiz.questions[row], response, len(key)), key))
+
+
+class AdaptiveSession:
+    """One learner's run through the bank: ability estimate and answers so far."""
+
+    def __init__(self, bank, user_id):
+        self.bank = bank
+        self.user_id = user_id
+        self.theta = 0.0
+        self.standard_error = ABILITY_SD
+        self.answered = np.zeros(len(bank), dtype=bool)
+        self.order = []
+        self.correct = []
+        self.current = None
+
+    def next_item(self):
+        """The unanswered item most informative at the current ability, or None."""
+        if self.current is None and not self.answered.all():
+            info = information(self.theta, self.bank.discrimination, self.bank.difficulty)
+            info[self.answered] = -np.inf
+            self.current = int(np.argmax(info))
+        return self.current
+
+    def answer(self, index, correct):
+        self.answered[index] = True
+        self.order.append(index)
+        self.correct.append(correct)
+        self.current = None
+        items = np.array(self.order)
+        self.theta, self.standard_error = estimate_ability(
+            self.bank.discrimination[items], self.bank.difficulty[items],
+            np.array(self.correct, dtype=float), self.theta,
+        )
+
+
+@st.cache_resource
+def get_item_bank():
+    db = get_database()
+    rows = db.query("SELECT item_id, discrimination, difficulty FROM item_parameters")
+    return ItemBank({row["item_id"]: (row["discrimination"], row["difficulty"]) for row in rows})
+
+
+def get_adaptive_session():
+    """Return the current user's AdaptiveSession, creating it on first use."""
+    user_id = get_user_id()
+    session = st.session_state.get("adaptive_session")
+    if session is None or session.user_id != user_id:
+        session = AdaptiveSession(get_item_bank(), user_id)
+        st.session_state.adaptive_session = session
+    return session
+
+
+def load_responses(db, bank):
+    """First answer per (learner, item) as a learners x items matrix (NaN = unseen).
+
+    Quiz attempts count every question not listed as missed as correct;
+    attempts recorded before misses were tracked are skipped.
+    """
+    quiz_rows = db.query(
+        "SELECT id, user_id, module, json_extract(payload, '$.missed') FROM events "
+        "WHERE kind = ? AND json_extract(payload, '$.missed') IS NOT NULL",
+        (QUIZ_ATTEMPT,),
+    )
+    attempts = pd.DataFrame.from_records(quiz_rows, columns=["id", "user_id", "module", "missed"])
+    items = pd.DataFrame(
+        [(module.key, quiz.questions[row].review, item_id)
+         for item_id, (module, quiz, row) in zip(bank.ids, bank.items)],
+        columns=["module", "review", "item_id"],
+    )
+    answers = attempts.merge(items, on="module")
+    missed = attempts[["id", "missed"]].assign(review=attempts["missed"].map(json.loads))
+    missed = missed.explode("review").dropna(subset=["review"])[["id", "review"]]
+    answers = answers.merge(missed, on=["id", "review"], how="left", indicator=True)
+    answers["correct"] = (answers["_merge"] == "left_only").astype(float)
+
+    adaptive_rows = db.query(
+        "SELECT id, user_id, json_extract(payload, '$.item_id'), "
+        "json_extract(payload, '$.correct') FROM events WHERE kind = ?",
+        (ADAPTIVE_ANSWER,),
+    )
+    adaptive = pd.DataFrame.from_records(
+        adaptive_rows, columns=["id", "user_id", "item_id", "correct"]
+    )
+    answers = pd.concat([answers[["id", "user_id", "item_id", "correct"]], adaptive])
+    answers = answers[answers["item_id"].isin(bank.position)]
+    answers = answers.sort_values("id").drop_duplicates(["user_id", "item_id"])
+
+    users, user_rows = np.unique(answers["user_id"].to_numpy(dtype=str), return_inverse=True)
+    matrix = np.full((len(users), len(bank)), np.nan)
+    matrix[user_rows, answers["item_id"].map(bank.position).to_numpy()] = answers["correct"]
+    return matrix
+
+
+def fit_items(responses, iterations=30, newton_steps=3):
+    """Fit item parameters to a learners x items matrix of 0/1/NaN answers.
+
+    Marginal maximum a posteriori by EM over a grid of ability levels: the
+    E-step spreads each learner over the grid with two matrix products, and
+    the M-step takes diagonal Newton steps on every item's (log a, b) at once
+    against the expected answer counts at each grid level.
+    Returns (discrimination, difficulty, expected ability per learner).
+    """
+    seen = ~np.isnan(responses)
+    answers = np.where(seen, responses, 0.0)
+    seen = seen.astype(float)
+    nodes = np.linspace(-4, 4, ABILITY_NODES)
+    log_prior = -0.5 * (nodes / ABILITY_SD) ** 2
+    log_a = np.zeros(responses.shape[1])
+    b = np.zeros(responses.shape[1])
+    for _ in range(iterations):
+        p = p_correct(nodes[:, None], np.exp(log_a), b)
+        log_likelihood = answers @ np.log(p).T + (seen - answers) @ np.log1p(-p).T
+        log_posterior = log_likelihood + log_prior
+        weights = np.exp(log_posterior - log_posterior.max(axis=1, keepdims=True))
+        weights /= weights.sum(axis=1, keepdims=True)
+        expected_seen = weights.T @ seen
+        expected_correct = weights.T @ answers
+
+        for _ in range(newton_steps):
+            a = np.exp(log_a)
+            p = p_correct(nodes[:, None], a, b)
+            residual = expected_correct - expected_seen * p
+            weight = expected_seen * p * (1 - p)
+            distance = nodes[:, None] - b
+
+            gradient = -(residual * a).sum(axis=0) - b / DIFFICULTY_SD ** 2
+            curvature = (weight * a * a).sum(axis=0) + 1 / DIFFICULTY_SD ** 2
+            b = np.clip(b + gradient / curvature, *DIFFICULTY_RANGE)
+
+            # Derivatives with respect to log a, so discrimination stays positive
+            gradient = (residual * a * distance).sum(axis=0) - log_a / LOG_DISCRIMINATION_SD ** 2
+            curvature = (weight * (a * distance) ** 2).sum(axis=0) + 1 / LOG_DISCRIMINATION_SD ** 2
+            log_a = np.clip(log_a + gradient / curvature, *np.log(DISCRIMINATION_RANGE))
+    return np.exp(log_a), b, weights @ nodes
+
+
+def refit_item_parameters(db):
+    """Fit the bank's items to recorded answers and store the parameters."""
+    bank = ItemBank()
+    responses = load_responses(db, bank)
+    if not len(responses):
+        return 0
+    discrimination, difficulty, _ = fit_items(responses)
+    counts = (~np.isnan(responses)).sum(axis=0)
+    now = time.time()
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO item_parameters (item_id, discrimination, difficulty, responses, fitted_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (item_id) DO UPDATE SET "
+            "discrimination = excluded.discrimination, difficulty = excluded.difficulty, "
+            "responses = excluded.responses, fitted_at = excluded.fitted_at",
+            zip(bank.ids, discrimination.tolist(), difficulty.tolist(), counts.tolist(), [now] * len(bank)),
+        )
+    return len(responses)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refit adaptive practice item parameters.")
+    parser.add_argument("--db", help="database path (default: the app database)")
+    args = parser.parse_args(argv)
+    db = Database(args.db) if args.db else Database()
+    print(f"Fit {len(ItemBank())} items to answers from {refit_item_parameters(db)} learners")
+
+
+if __name__ == "__main__":
+    main()
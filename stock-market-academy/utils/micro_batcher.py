@@ -0,0 +1,104 @@
+import atexit
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Run `forward` over batches of inputs submitted from many threads.
+
+    `submit` queues one input and returns a Future. A worker thread takes up
+    to `max_batch` inputs once that many are waiting or the oldest has waited
+    `max_wait_ms`, calls `forward(inputs)` once, and resolves each Future with
+    its output, or with the exception `forward` raised. An output that is
+    itself an exception fails only its own Future. Under light load a
+    request waits at most `max_wait_ms` extra; under heavy load batches fill
+    straight away and every forward pass serves `max_batch` requests.
+    """
+
+    def __init__(self, forward, max_batch=16, max_wait_ms=10.0):
+        self.forward = forward
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self._pending = collections.deque()  # (input, future, queued at)
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __len__(self):
+        with self._condition:
+            return len(self._pending)
+
+    @property
+    def mean_batch_size(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def submit(self, item):
+        """Queue one input; the returned Future resolves to its output."""
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("batcher is closed")
+            self._pending.append((item, future, time.monotonic()))
+            # Wake the worker to start the wait timer, or to run a full batch
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._condition.notify()
+        return future
+
+    def close(self):
+        """Stop taking inputs, finish what is queued and stop the worker."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=5)
+
+    def _next_batch(self):
+        """Wait for a full or overdue batch; None once closed and drained."""
+        with self._condition:
+            while True:
+                if self._pending:
+                    waited = time.monotonic() - self._pending[0][2]
+                    if self._closed or len(self._pending) >= self.max_batch or waited >= self.max_wait:
+                        size = min(self.max_batch, len(self._pending))
+                        return [self._pending.popleft() for _ in range(size)]
+                    self._condition.wait(self.max_wait - waited)
+                elif self._closed:
+                    return None
+                else:
+                    self._condition.wait()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Skip requests whose caller cancelled while they were queued
+            live = [(item, future) for item, future, _ in batch if future.set_running_or_notify_cancel()]
+            if not live:
+                continue
+            try:
+                outputs = self.forward([item for item, _ in live])
+                if len(outputs) != len(live):
+                    raise ValueError(f"forward returned {len(outputs)} outputs for {len(live)} inputs")
+            except Exception as e:
+                logger.exception("Batch of %d failed", len(live))
+                for _, future in live:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(live)
+            for (_, future), output in zip(live, outputs):
+                if isinstance(output, BaseException):
+                    future.set_exception(output)
+                else:
+                    future.set_result(output)
@@ -0,0 +1,207 @@
+"""Generated numeric questions with multiple-choice distractors.
+
+Each template samples its parameters and solves for the answer and three
+common-mistake distractors as whole arrays, so a pool of thousands of
+variants is built in one pass when the app starts. Serving a question picks
+a random row and formats it.
+"""
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+
+POOL_SIZE = 5000
+
+Template = namedtuple("Template", ["key", "title", "prompt", "explanation", "unit", "solve"])
+GeneratedQuestion = namedtuple("GeneratedQuestion", ["prompt", "options", "answer", "explanation"])
+
+
+def _sip(rng, n):
+    monthly = rng.choice(np.arange(500, 20001, 500), n)
+    years = rng.integers(3, 31, n)
+    rate = rng.choice(np.arange(6.0, 15.5, 0.5), n)
+    monthly_rate = rate / 1200
+    months = years * 12
+    invested = monthly * months
+    # Contributions at the start of each month, compounded monthly
+    future_value = monthly * ((1 + monthly_rate) ** months - 1) / monthly_rate * (1 + monthly_rate)
+    distractors = np.column_stack([
+        invested,  # no growth at all
+        invested * (1 + rate / 100 * years),  # simple interest on the whole amount
+        invested * (1 + rate / 100) ** years,  # everything invested on day one
+    ])
+    params = {"monthly": monthly, "years": years, "rate": rate, "invested": invested}
+    return params, future_value, distractors
+
+
+def _index_weight(rng, n):
+    caps = rng.integers(50, 1500, (n, 3)) * 1000
+    total = caps.sum(axis=1)
+    weight = caps[:, 0] / total * 100
+    distractors = np.column_stack([
+        np.full(n, 100 / 3),  # equal weighting
+        caps[:, 1] / total * 100,  # another company's weight
+        caps[:, 0] / (caps[:, 1] + caps[:, 2]) * 100,  # compared with the others only
+    ])
+    params = {"cap_a": caps[:, 0], "cap_b": caps[:, 1], "cap_c": caps[:, 2], "total": total}
+    return params, weight, distractors
+
+
+def _index_move(rng, n):
+    count = rng.choice([10, 20, 30, 50], n)
+    weight = rng.integers(2, 30, n).astype(float)
+    move = rng.integers(2, 21, n).astype(float)
+    index_move = weight * move / 100
+    distractors = np.column_stack([
+        move,  # the stock's own move
+        move / count,  # as if every company weighed the same
+        weight * move / 10,  # a slipped decimal
+    ])
+    params = {"count": count, "weight": weight, "move": move}
+    return params, index_move, distractors
+
+
+def _pe_ratio(rng, n):
+    eps = rng.integers(5, 200, n).astype(float)
+    pe = rng.choice(np.arange(8.0, 60.5, 0.5), n)
+    price = np.round(eps * pe)
+    ratio = price / eps
+    distractors = np.column_stack([
+        eps / price * 100,  # earnings yield instead
+        (price - eps) / eps,  # price gain over earnings
+        price / eps / 10,  # a slipped decimal
+    ])
+    params = {"price": price, "eps": eps}
+    return params, ratio, distractors
+
+
+TEMPLATES = {
+    template.key: template
+    for template in [
+        Template(
+            "sip", "💰 SIP Growth",
+            "You invest ₹{monthly:,.0f} at the start of every month for {years} years, earning "
+            "{rate:g}% a year compounded monthly. Roughly what is your investment worth at the end?",
+            "Over {years} years you put in ₹{invested:,.0f}. Each monthly instalment compounds at "
+            "{rate:g}%/12 a month for the months it stays invested, which adds up to {answer}.",
+            "currency", _sip,
+        ),
+        Template(
+            "index_weight", "⚖️ Index Weighting",
+            "A market-cap weighted index holds three companies worth ₹{cap_a:,.0f} crore, "
+            "₹{cap_b:,.0f} crore and ₹{cap_c:,.0f} crore. What weight does the first company have?",
+            "Weight = company value ÷ total value = ₹{cap_a:,.0f} ÷ ₹{total:,.0f} crore = {answer}.",
+            "percent", _index_weight,
+        ),
+        Template(
+            "index_move", "📈 Index Moves",
+            "In an index of {count} companies, one company makes up {weight:g}% of the index. If its "
+            "share price rises {move:g}% and every other stock stays flat, how much does the index rise?",
+            "The index moves by weight × price move = {weight:g}% × {move:g}% = {answer}.",
+            "percent", _index_move,
+        ),
+        Template(
+            "pe_ratio", "🧮 P/E Ratio",
+            "A share trades at ₹{price:,.0f} and the company earned ₹{eps:,.0f} per share last year. "
+            "What is its price-to-earnings (P/E) ratio?",
+            "P/E = share price ÷ earnings per share = ₹{price:,.0f} ÷ ₹{eps:,.0f} = {answer}.",
+            "ratio", _pe_ratio,
+        ),
+    ]
+}
+
+_FORMATS = {
+    "currency": "₹{:,.0f}",
+    "percent": "{:.2f}%",
+    "ratio": "{:.1f}",
+}
+_DECIMALS = {"currency": 0, "percent": 2, "ratio": 1}
+
+
+class QuestionPool:
+    """Precomputed variants of one template, as parameter and option arrays."""
+
+    def __init__(self, template, size=POOL_SIZE, seed=0):
+        rng = np.random.default_rng(seed)
+        self.template = template
+        self.params, answers, distractors = template.solve(rng, size)
+        values = np.column_stack([answers, distractors])
+        values = self._separate(values, _DECIMALS[template.unit])
+        # Shuffle each row's options; column 0 held the answer
+        order = np.argsort(rng.random(values.shape), axis=1)
+        self.options = np.take_along_axis(values, order, axis=1)
+        self.answers = np.argmax(order == 0, axis=1)
+
+    def __len__(self):
+        return len(self.answers)
+
+    @staticmethod
+    def _separate(values, decimals):
+        """Nudge distractors apart until no two options display the same."""
+        for _ in range(10):
+            shown = np.round(values, decimals)
+            clash = np.zeros(values.shape, dtype=bool)
+            for column in range(1, values.shape[1]):
+                clash[:, column] = (shown[:, :column] == shown[:, [column]]).any(axis=1)
+            if not clash.any():
+                break
+            values = np.where(clash, values * 1.15 + 10 ** -decimals, values)
+        return values
+
+    def draw(self, rng):
+        row = int(rng.integers(len(self)))
+        fmt = _FORMATS[self.template.unit]
+        params = {name: values[row] for name, values in self.params.items()}
+        options = [fmt.format(value) for value in self.options[row]]
+        answer = int(self.answers[row])
+        return GeneratedQuestion(
+            self.template.prompt.format(**params),
+            options,
+            answer,
+            self.template.explanation.format(answer=options[answer], **params),
+        )
+
+
+@st.cache_resource
+def get_question_pools():
+    """Pools for every template, built once per process."""
+    return {
+        key: QuestionPool(template, seed=seed)
+        for seed, (key, template) in enumerate(TEMPLATES.items())
+    }
+
+
+def render_numeric_practice(template_keys, key):
+    """A generated question from one of `template_keys`, with a fresh one on request."""
+    pools = get_question_pools()
+    state_key = f"numeric_{key}"
+    rng = np.random.default_rng()
+
+    if len(template_keys) > 1:
+        template_key = st.radio(
+            "Question type:", template_keys, horizontal=True, key=f"{state_key}_type",
+            format_func=lambda k: TEMPLATES[k].title,
+        )
+    else:
+        template_key = template_keys[0]
+
+    current = st.session_state.get(state_key)
+    if current is None or current[0] != template_key:
+        current = (template_key, pools[template_key].draw(rng), 0)
+        st.session_state[state_key] = current
+    _, question, serial = current
+
+    with st.form(f"{state_key}_form_{serial}"):
+        st.markdown(f"**{question.prompt}**")
+        choice = st.radio("Your answer:", range(len(question.options)),
+                          format_func=lambda i: question.options[i], key=f"{state_key}_{serial}")
+        if st.form_submit_button("Check Answer"):
+            if choice == question.answer:
+                st.success(f"✅ Correct! {question.explanation}")
+            else:
+                st.error(f"❌ Not quite. {question.explanation}")
+
+    def next_question():
+        st.session_state[state_key] = (template_key, pools[template_key].draw(rng), serial + 1)
+
+    st.button("🎲 New Question", key=f"{state_key}_next", on_click=next_question)
@@ -1,13 +1,52 @@
+from utils.database import get_database
+from utils.events import COMPLETION, QUIZ_ATTEMPT, get_event_buffer, make_event
+from utils.identity import get_user_id
+from utils.registry import BY_KEY, MODULE_COUNT
+
+
 class ProgressTracker:
-    def __init__(self):
-        self.completed = set()
-    
+    """Completed modules as a bitmask over the module registry.
+
+    With a database the user's mask is read once when the tracker is
+    created. Completions and quiz attempts are handed to a write-behind
+    event buffer, so recording them never waits on storage.
+    """
+
+    def __init__(self, user_id=None, db=None, events=None):
+        self.user_id = user_id
+        self.events = events
+        self.completed_mask = 0
+        if db is not None:
+            rows = db.query("SELECT completed_mask FROM progress WHERE user_id = ?", (user_id,))
+            if rows:
+                self.completed_mask = rows[0]["completed_mask"]
+
     def mark_completed(self, module):
-        self.completed.add(module)
-    
+        bit = 1 << BY_KEY[module].position
+        if not self.completed_mask & bit:
+            self.completed_mask |= bit
+            self._record(COMPLETION, module)
+
     def is_completed(self, module):
-        return module in self.completed
-    
+        return bool(self.completed_mask & (1 << BY_KEY[module].position))
+
     def get_overall_progress(self):
-        # Example: 7 modules in total
-        return (len(self.completed) / 7) * 100
+        return (bin(self.completed_mask).count("1") / MODULE_COUNT) * 100
+
+    def record_quiz_attempt(self, module, score, total, missed=(), chosen=None):
+        """Record a quiz result; `missed` prompts are scheduled for review.
+
+        `chosen` maps question keys to the option indices picked, for the
+        per-question statistics.
+        """
+        self._record(QUIZ_ATTEMPT, module, score=score, total=total, missed=list(missed),
+                     chosen=chosen or {})
+
+    def _record(self, kind, module, **payload):
+        if self.events is not None:
+            self.events.put(make_event(self.user_id, kind, module, **payload))
+
+
+def load_progress_tracker():
+    """Create a tracker for the current user, backed by the app database."""
+    return ProgressTracker(get_user_id(), get_database(), get_event_buffer())
@@ -0,0 +1,257 @@
+"""The landing page's Q&A model, loaded off the request path.
+
+Loading starts on a background thread the first time any session asks for
+the model, so the page renders straight away and only that thread pays for
+`import torch`. Until the model is ready the Q&A box says it is warming up;
+if loading fails the box shows why and the rest of the page is unaffected.
+
+The model file is re-checked at most every 30 seconds as the landing page
+runs, and reloaded in the background when it changes.
+
+Questions from every session go through one shared MicroBatcher, so
+concurrent askers share batched forward passes on a single worker thread
+instead of contending for CPU threads with one pass each. Answers are
+cached by normalized question, so repeats never reach the model, and a
+second cache answers close paraphrases of questions already asked.
+
+Before a question reaches the model, the most relevant lesson sections are
+retrieved from a local index and put in front of it as context; they come
+back with the answer so the page can link to them.
+"""
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+import streamlit as st
+
+from utils.answer_cache import get_answer_cache, normalize_question
+from utils.micro_batcher import MicroBatcher
+from utils.retrieval import TOP_K, get_lesson_index
+from utils.semantic_cache import embed_question, get_semantic_cache, negation_words
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.environ.get("ACADEMY_MODEL_PATH", "path/to/model.pt")
+MAX_BATCH = 16
+MAX_WAIT_MS = 10.0
+ANSWER_TIMEOUT = 30.0
+CONTEXT_CHARS = 800
+RELOAD_INTERVAL = 30.0
+
+PROMPT = (
+    "Answer the question using these lessons from the academy.\n\n"
+    "{context}\n\nQuestion: {question}\nAnswer:"
+)
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+_MISSING = object()
+
+# The model's reply and the lesson sections that match the question
+Answer = namedtuple("Answer", ["text", "sources"])
+
+
+class ModelLoader:
+    """Load a torch model on a daemon thread and report how it went.
+
+    `check_for_update` re-stats the model file at most every
+    `reload_interval` seconds and reloads it in the background when it has
+    changed; the old model keeps answering until the new one is ready, and
+    stays in place if the reload fails.
+    """
+
+    def __init__(self, path=MODEL_PATH, reload_interval=RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.model = None
+        self.version = None
+        self.error = None
+        self.status = LOADING
+        self._batched = None
+        self._identity = None  # size and mtime of the file last loaded
+        self._checked_at = time.monotonic()
+        self._loading = True
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def forward(self, questions):
+        """Answer a batch with whichever model is current."""
+        return self._batched(questions)
+
+    def check_for_update(self):
+        """Start a reload if the model file changed; True if one started."""
+        now = time.monotonic()
+        with self._lock:
+            if self._loading or now - self._checked_at < self.reload_interval:
+                return False
+            self._checked_at = now
+            try:
+                identity = _file_identity(self.path)
+            except OSError:
+                return False
+            if identity == self._identity:
+                return False
+            self._loading = True
+        logger.info("Model file %s changed; reloading", self.path)
+        threading.Thread(target=self._load, name="model-loader", daemon=True).start()
+        return True
+
+    def _load(self):
+        started = time.perf_counter()
+        if self.model is None:
+            self.status = LOADING
+        identity = None
+        try:
+            identity = _file_identity(self.path)
+            import torch
+
+            model = torch.load(self.path)
+        except Exception as e:
+            logger.exception("Failed to load model from %s", self.path)
+            if self.model is None:
+                self.error = str(e)
+                self.status = FAILED
+        else:
+            # A model can name its own version; otherwise the file's identity stands in
+            version = getattr(model, "version", None) or f"{self.path}:{identity[0]}:{identity[1]}"
+            self._batched = BatchedModel(model)
+            self.model = model
+            self.version = version
+            self.error = None
+            self.status = READY
+            logger.info("Loaded model from %s in %.1fs", self.path, time.perf_counter() - started)
+        finally:
+            with self._lock:
+                self._identity = identity
+                self._checked_at = time.monotonic()
+                self._loading = False
+
+
+def _file_identity(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class BatchedModel:
+    """Answer a list of questions with one model call where the model allows.
+
+    The first batch tries the model on the whole list; a model that rejects
+    lists with a TypeError, or doesn't return one answer per question, is
+    called once per question from then on. Any other failure of a batched
+    call retries that batch one question at a time, and a question the
+    model still fails on gets its exception back in place of an answer, so
+    one bad input doesn't fail the questions batched with it.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.batched = None  # unknown until the first batch
+
+    def __call__(self, questions):
+        import torch
+
+        with torch.inference_mode():
+            if self.batched is not False:
+                try:
+                    answers = self.model(questions)
+                except TypeError:
+                    answers = None
+                except Exception:
+                    # Most likely one bad question; the others still get answers
+                    logger.exception("Batch of %d questions failed; retrying one at a time", len(questions))
+                    answers = _MISSING
+                if answers is not _MISSING:
+                    if _one_per_question(answers, questions):
+                        self.batched = True
+                        return list(answers)
+                    if self.batched is None:
+                        logger.info("Model doesn't take batches; answering one question at a time")
+                        self.batched = False
+            return self._one_at_a_time(questions)
+
+    def _one_at_a_time(self, questions):
+        answers = []
+        for question in questions:
+            try:
+                answers.append(self.model(question))
+            except Exception as e:
+                logger.exception("Model failed on a question")
+                answers.append(e)
+        return answers
+
+
+def _one_per_question(answers, questions):
+    if answers is None or isinstance(answers, str):
+        return False
+    try:
+        return len(answers) == len(questions)
+    except TypeError:
+        return False
+
+
+@st.cache_resource
+def get_model_loader():
+    """The process-wide loader, started on first use."""
+    return ModelLoader().start()
+
+
+@st.cache_resource
+def get_inference_service():
+    """The process-wide micro-batcher over the loaded model.
+
+    Only call this once the loader is READY; the error raised before then
+    is not cached, so a later call succeeds.
+    """
+    loader = get_model_loader()
+    if loader.status != READY:
+        raise RuntimeError(f"model is {loader.status}")
+    return MicroBatcher(loader.forward, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS)
+
+
+def build_prompt(question, sections):
+    """The model input: the question, preceded by lesson sections if there are any."""
+    if not sections:
+        return question
+    context = "\n\n".join(
+        f"{section['page']} - {section['title']}:\n{section['content'][:CONTEXT_CHARS]}"
+        for section in sections
+    )
+    return PROMPT.format(context=context, question=question)
+
+
+def _generate(question, timeout):
+    sources = get_lesson_index().search(question, TOP_K)
+    text = get_inference_service().submit(build_prompt(question, sources)).result(timeout)
+    return Answer(text, sources)
+
+
+def ask_model(question, timeout=ANSWER_TIMEOUT):
+    """Answer one question from the caches, or from the model with lesson context."""
+    version = get_model_loader().version
+    key = normalize_question(question)
+    if not key:
+        return _generate(question, timeout)
+
+    cache = get_answer_cache()
+    answer = cache.get(key, version, _MISSING)
+    if answer is not _MISSING:
+        return answer
+    vector, negations = embed_question(question), negation_words(question)
+    semantic = get_semantic_cache()
+    answer = semantic.get(vector, negations, version, _MISSING)
+    if answer is not _MISSING:
+        # Link the lessons that match this wording, not the cached question's
+        return answer._replace(sources=get_lesson_index().search(question, TOP_K))
+    # Paraphrase hits stay out of the exact cache, so only model answers land there
+    answer = _generate(question, timeout)
+    semantic.put(vector, negations, answer, version)
+    cache.put(key, answer, version)
+    return answer
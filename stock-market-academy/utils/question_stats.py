@@ -0,0 +1,143 @@
+"""Per-question difficulty and distractor statistics for the lesson quizzes.
+
+Classical item analysis over each learner's first attempt at every quiz:
+
+- p-value: the share of learners who answered the question correctly
+- discrimination index: the p-value among the top 27% of attempts by quiz
+  score minus the p-value among the bottom 27%, leaving out scores tied
+  across either boundary
+- option counts: how often each option was picked
+
+Everything is computed with a few group-bys over one row per answered
+question. Run `python -m utils.question_stats` (for example nightly from
+cron) to rewrite the `question_stats` table that the admin dashboard reads.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.database import Database
+from utils.events import QUIZ_ATTEMPT
+from utils.quiz_engine import QUIZ_BANK
+from utils.registry import BY_KEY
+from utils.review_scheduler import question_id
+
+GROUP_FRACTION = 0.27
+
+
+def quiz_questions():
+    """Every quiz question with its item id, one row each."""
+    return pd.DataFrame(
+        [(module, question.key, question.review, question_id(BY_KEY[module].title, question.review),
+          len(question.options))
+         for module, quiz in QUIZ_BANK.items() for question in quiz.questions],
+        columns=["module", "question", "review", "item_id", "width"],
+    )
+
+
+def load_attempts(db):
+    """Each learner's first quiz attempt per module that recorded its misses."""
+    rows = db.query(
+        "SELECT id, user_id, module, json_extract(payload, '$.score'), "
+        "json_extract(payload, '$.total'), json_extract(payload, '$.missed'), "
+        "json_extract(payload, '$.chosen') FROM events "
+        "WHERE kind = ? AND json_extract(payload, '$.missed') IS NOT NULL ORDER BY id",
+        (QUIZ_ATTEMPT,),
+    )
+    attempts = pd.DataFrame.from_records(
+        rows, columns=["id", "user_id", "module", "score", "total", "missed", "chosen"]
+    )
+    attempts = attempts[attempts["module"].isin(QUIZ_BANK)]
+    return attempts.drop_duplicates(["user_id", "module"])
+
+
+def answer_frame(attempts, questions):
+    """One row per (attempt, question) with whether it was answered correctly.
+
+    Each attempt is also flagged as in the upper or lower scoring group of
+    its quiz. Tied scores are never split: an attempt is upper only if at
+    least 73% of attempts scored strictly less, and lower only if at least
+    73% scored strictly more, so a score straddling a boundary is left out.
+    """
+    ratio = (attempts["score"] / attempts["total"]).groupby(attempts["module"])
+    size = ratio.transform("size")
+    below = ratio.rank(method="min") - 1
+    above = size - ratio.rank(method="max")
+    attempts = attempts.assign(
+        upper=below >= (1 - GROUP_FRACTION) * size, lower=above >= (1 - GROUP_FRACTION) * size
+    )
+    answers = attempts[["id", "module", "upper", "lower"]].merge(questions, on="module")
+    missed = attempts[["id"]].assign(review=attempts["missed"].map(json.loads))
+    missed = missed.explode("review").dropna(subset=["review"])
+    answers = answers.merge(missed, on=["id", "review"], how="left", indicator=True)
+    return answers.assign(correct=(answers["_merge"] == "left_only").astype(float))
+
+
+def option_counts(attempts, questions):
+    """Picks per (item, option index), for attempts that recorded their choices."""
+    chosen = attempts[["module", "chosen"]].dropna()
+    chosen = chosen.assign(question=chosen["chosen"].map(lambda c: list(json.loads(c).items())))
+    chosen = chosen.explode("question").dropna(subset=["question"])
+    chosen[["question", "option"]] = pd.DataFrame(chosen["question"].tolist(), index=chosen.index)
+    chosen = chosen.explode("option").dropna(subset=["option"])
+    chosen = chosen.merge(questions, on=["module", "question"])
+    chosen = chosen[chosen["option"].astype(int) < chosen["width"]]
+    return chosen.groupby(["item_id", chosen["option"].astype(int)]).size()
+
+
+def question_statistics(attempts, questions):
+    """p-value, discrimination index and option counts per answered item."""
+    answers = answer_frame(attempts, questions)
+    stats = answers.groupby("item_id").agg(
+        module=("module", "first"),
+        question=("question", "first"),
+        width=("width", "first"),
+        attempts=("correct", "size"),
+        p_value=("correct", "mean"),
+    )
+    upper = answers[answers["upper"]].groupby("item_id")["correct"].mean()
+    lower = answers[answers["lower"]].groupby("item_id")["correct"].mean()
+    stats["discrimination"] = upper.sub(lower).reindex(stats.index)
+
+    counts = option_counts(attempts, questions).unstack(fill_value=0)
+    counts = counts.reindex(index=stats.index, columns=range(int(stats["width"].max())), fill_value=0)
+    stats["option_counts"] = [
+        json.dumps(row[:width].tolist())
+        for row, width in zip(counts.to_numpy(dtype=int), stats["width"])
+    ]
+    return stats.drop(columns="width")
+
+
+def refresh_question_stats(db):
+    """Recompute the stats table from recorded quiz attempts."""
+    attempts = load_attempts(db)
+    stats = question_statistics(attempts, quiz_questions()) if len(attempts) else pd.DataFrame()
+    now = time.time()
+    rows = [
+        (item_id, row.module, row.question, int(row.attempts), float(row.p_value),
+         None if np.isnan(row.discrimination) else float(row.discrimination), row.option_counts, now)
+        for item_id, row in zip(stats.index, stats.itertuples())
+    ]
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM question_stats")
+        conn.executemany(
+            "INSERT INTO question_stats (item_id, module, question, attempts, p_value, "
+            "discrimination, option_counts, computed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(attempts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute per-question quiz statistics.")
+    parser.add_argument("--db", help="database path (default: the app database)")
+    args = parser.parse_args(argv)
+    db = Database(args.db) if args.db else Database()
+    print(f"Computed question statistics from {refresh_question_stats(db)} quiz attempts")
+
+
+if __name__ == "__main__":
+    main()
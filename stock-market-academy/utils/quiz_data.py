@@ -0,0 +1,284 @@
+"""Lesson quizzes as data, keyed by module key.
+
+Each question is shown with `widget` ("radio" or "multiselect") and is
+graded against `answer` (one option, or the list of correct options).
+"exact" questions earn a point for matching the answer exactly and show
+`correct` or `incorrect`; "per_option" questions earn a point for every
+correct option picked and show `distractor` if any wrong one was picked.
+`review` is the text a missed question is reviewed under (default: the
+prompt). The first result whose `min_score` is reached is shown, and
+`complete` marks the module completed.
+"""
+
+QUIZZES = {
+    "1_📈_What_is_a_Stock": {
+        "form": "stock_quiz",
+        "title": "🧠 Quick Knowledge Check",
+        "intro": "**Test your understanding:**",
+        "submit": "Check My Answers",
+        "show_score": True,
+        "questions": [
+            {
+                "key": "q1",
+                "prompt": "When you buy a stock, you become:",
+                "widget": "radio",
+                "options": ["A lender to the company", "A partial owner of the company", "An employee of the company", "A customer of the company"],
+                "answer": "A partial owner of the company",
+                "correct": "✅ Correct! You become a partial owner.",
+                "incorrect": "❌ Not quite. When you buy stock, you become a partial owner of the company.",
+            },
+            {
+                "key": "q2",
+                "prompt": "In the handbag analogy, what does your investment amount represent?",
+                "widget": "radio",
+                "options": ["The price of the handbag", "Your share of ownership", "The store where you buy", "The friends you're with"],
+                "answer": "Your share of ownership",
+                "correct": "✅ Correct! Your investment determines your ownership share.",
+                "incorrect": "❌ Not quite. Your investment amount determines your share of ownership.",
+            },
+        ],
+        "results": [
+            {"min_score": 2, "level": "success", "message": "🎉 Perfect! You've mastered the basics of what a stock is!", "complete": True},
+        ],
+    },
+    "2_🏢_Why_Companies_Go_Public": {
+        "form": "public_quiz",
+        "title": "🧠 Test Your Understanding",
+        "intro": "**Quick Check:** Why might a company choose to go public?",
+        "submit": "Check My Answer",
+        "show_score": False,
+        "questions": [
+            {
+                "key": "public_reasons",
+                "prompt": "Select all correct reasons:",
+                "review": "Why might a company choose to go public?",
+                "widget": "multiselect",
+                "scoring": "per_option",
+                "options": [
+                    "To raise money for expansion",
+                    "To pay off existing debt",
+                    "To acquire other businesses",
+                    "To avoid paying taxes",
+                    "To provide exit opportunities for early investors",
+                    "To increase company visibility",
+                ],
+                "answer": [
+                    "To raise money for expansion",
+                    "To pay off existing debt",
+                    "To acquire other businesses",
+                    "To provide exit opportunities for early investors",
+                    "To increase company visibility",
+                ],
+                "distractor": "❌ Going public doesn't help avoid taxes - that's incorrect!",
+            },
+        ],
+        "results": [
+            {"min_score": 4, "level": "success", "message": "🎉 Excellent! You selected {score} correct reasons!", "complete": True},
+            {"min_score": 2, "level": "info", "message": "Good job! You got {score} correct reasons. Review the content for the ones you missed."},
+            {"min_score": 0, "level": "warning", "message": "Keep learning! Review the reasons why companies go public."},
+        ],
+    },
+    "3_🛒_Where_to_Buy_Stocks": {
+        "form": "market_quiz",
+        "title": "🧠 Test Your Market Knowledge",
+        "submit": "Check My Understanding",
+        "show_score": True,
+        "questions": [
+            {
+                "key": "market_q1",
+                "prompt": "When you buy Apple stock today on the stock exchange, who receives your money?",
+                "widget": "radio",
+                "options": ["Apple Inc. (the company)", "Another investor selling their Apple shares", "The stock exchange", "The government"],
+                "answer": "Another investor selling their Apple shares",
+                "correct": "✅ Correct! In secondary market trading, you buy from other investors.",
+                "incorrect": "❌ When buying on exchanges, you're buying from other investors, not the company.",
+            },
+            {
+                "key": "market_q2",
+                "prompt": "What is an IPO?",
+                "widget": "radio",
+                "options": ["A way to buy stocks cheaply", "When a company sells shares to the public for the first time", "A type of stock exchange", "When stock prices go up"],
+                "answer": "When a company sells shares to the public for the first time",
+                "correct": "✅ Correct! IPO = Initial Public Offering.",
+                "incorrect": "❌ IPO stands for Initial Public Offering - the first time a company sells shares publicly.",
+            },
+            {
+                "key": "market_q3",
+                "prompt": "Which market provides more buying opportunities for regular investors?",
+                "widget": "radio",
+                "options": ["Primary Market", "Secondary Market", "Both are equal", "Neither"],
+                "answer": "Secondary Market",
+                "correct": "✅ Correct! Secondary markets are open daily for trading.",
+                "incorrect": "❌ Secondary markets provide more opportunities since they're open for trading every business day.",
+            },
+        ],
+        "results": [
+            {"min_score": 3, "level": "success", "message": "🎉 Perfect! You understand how stock markets work!", "complete": True},
+            {"min_score": 2, "level": "info", "message": "Great job! Review the areas you missed."},
+            {"min_score": 0, "level": "warning", "message": "Keep studying! Understanding markets is crucial for investing."},
+        ],
+    },
+    "4_📊_Stock_Exchanges": {
+        "form": "exchange_quiz",
+        "title": "🧠 Exchange Knowledge Check",
+        "submit": "Check My Knowledge",
+        "show_score": True,
+        "questions": [
+            {
+                "key": "exchange_q1",
+                "prompt": "In the mall analogy, what do the individual shops represent?",
+                "widget": "radio",
+                "options": ["Stock exchanges", "Companies listed on the exchange", "Investors", "Brokers"],
+                "answer": "Companies listed on the exchange",
+                "correct": "✅ Correct! Individual shops represent companies.",
+                "incorrect": "❌ In the mall analogy, shops represent companies listed on the exchange.",
+            },
+            {
+                "key": "exchange_q2",
+                "prompt": "What is the primary role of stock exchange management?",
+                "widget": "radio",
+                "options": ["To set stock prices", "To ensure fair trading and maintain records", "To give investment advice", "To guarantee profits"],
+                "answer": "To ensure fair trading and maintain records",
+                "correct": "✅ Correct! Exchanges ensure fair, transparent trading.",
+                "incorrect": "❌ Exchange management ensures fair trading and keeps records.",
+            },
+            {
+                "key": "exchange_q3",
+                "prompt": "Which of these are major stock exchanges?",
+                "widget": "multiselect",
+                "options": ["NYSE", "NASDAQ", "BSE", "NSE", "McDonald's", "Apple Store"],
+                "answer": ["NYSE", "NASDAQ", "BSE", "NSE"],
+                "correct": "✅ Perfect! You identified all the stock exchanges correctly.",
+                "incorrect": "❌ NYSE, NASDAQ, BSE, and NSE are stock exchanges. McDonald's and Apple Store are not!",
+            },
+        ],
+        "results": [
+            {"min_score": 3, "level": "success", "message": "🎉 Excellent! You understand how stock exchanges work!", "complete": True},
+        ],
+    },
+    "5_💰_Stock_Pricing": {
+        "form": "pricing_quiz",
+        "title": "🧠 Price Discovery Quiz",
+        "submit": "Test My Understanding",
+        "show_score": True,
+        "questions": [
+            {
+                "key": "pricing_q1",
+                "prompt": "What is the primary factor that determines stock prices?",
+                "widget": "radio",
+                "options": ["The company CEO", "Government regulations", "Supply and demand", "The stock exchange"],
+                "answer": "Supply and demand",
+                "correct": "✅ Correct! Supply and demand drive stock prices.",
+                "incorrect": "❌ Stock prices are determined by supply and demand in the market.",
+            },
+            {
+                "key": "pricing_q2",
+                "prompt": "If more people want to buy a stock than sell it, what happens to the price?",
+                "widget": "radio",
+                "options": ["It goes down", "It goes up", "It stays the same", "It becomes volatile"],
+                "answer": "It goes up",
+                "correct": "✅ Right! High demand with low supply pushes prices up.",
+                "incorrect": "❌ When demand exceeds supply, prices rise.",
+            },
+            {
+                "key": "pricing_q3",
+                "prompt": "Which factors can influence stock prices? (Select all that apply)",
+                "widget": "multiselect",
+                "options": ["Company earnings", "Economic conditions", "Market sentiment", "News events", "The weather", "Industry trends"],
+                "answer": ["Company earnings", "Economic conditions", "Market sentiment", "News events", "Industry trends"],
+                "correct": "✅ Perfect! You identified the key price factors.",
+                "incorrect": "❌ All except 'The weather' can influence stock prices!",
+            },
+        ],
+        "results": [
+            {"min_score": 3, "level": "success", "message": "🎉 Excellent! You understand how stock prices work!", "complete": True},
+        ],
+    },
+    "6_☕_Market_Analogies": {
+        "form": "analogy_quiz",
+        "title": "🧠 Analogy Knowledge Check",
+        "submit": "Test My Understanding",
+        "show_score": True,
+        "questions": [
+            {
+                "key": "analogy_q1",
+                "prompt": "In the coffee vs matcha analogy, what type of stock does coffee represent?",
+                "widget": "radio",
+                "options": ["Growth stock", "Blue-chip stock", "Penny stock", "International stock"],
+                "answer": "Blue-chip stock",
+                "correct": "✅ Correct! Coffee represents stable, established blue-chip stocks.",
+                "incorrect": "❌ Coffee represents blue-chip stocks - stable and established.",
+            },
+            {
+                "key": "analogy_q2",
+                "prompt": "What does the 'Beauty Basket' analogy help explain?",
+                "widget": "radio",
+                "options": ["How to buy beauty products", "How market indices work", "How to start a beauty business", "How to invest in beauty companies"],
+                "answer": "How market indices work",
+                "correct": "✅ Right! The beauty basket shows how indices track market segments.",
+                "incorrect": "❌ The beauty basket analogy explains how market indices work.",
+            },
+            {
+                "key": "analogy_q3",
+                "prompt": "In the seesaw analogy, why don't all companies have equal impact on an index?",
+                "widget": "radio",
+                "options": ["Some companies are older", "Larger companies have more weight/influence", "Some companies are more popular", "It's random"],
+                "answer": "Larger companies have more weight/influence",
+                "correct": "✅ Perfect! Larger companies have more impact, just like heavier people on a seesaw.",
+                "incorrect": "❌ Like a seesaw, larger companies have more weight and influence in indices.",
+            },
+        ],
+        "results": [
+            {"min_score": 3, "level": "success", "message": "🎉 Fantastic! You've mastered market analogies!", "complete": True},
+        ],
+    },
+    "7_📋_Market_Indices": {
+        "form": "index_quiz",
+        "title": "🧠 Index Knowledge Challenge",
+        "submit": "Test My Index Knowledge",
+        "show_score": True,
+        "questions": [
+            {
+                "key": "index_q1",
+                "prompt": "What does a stock market index represent?",
+                "widget": "radio",
+                "options": ["A single company's performance", "A group of selected stocks representing market segments", "Government economic policy", "Currency exchange rates"],
+                "answer": "A group of selected stocks representing market segments",
+                "correct": "✅ Correct! Indices represent groups of stocks from market segments.",
+                "incorrect": "❌ Market indices represent groups of selected stocks, not individual companies.",
+            },
+            {
+                "key": "index_q2",
+                "prompt": "In the classroom analogy, what does the class average represent?",
+                "widget": "radio",
+                "options": ["Individual student performance", "The market index", "The teacher's evaluation", "School administration"],
+                "answer": "The market index",
+                "correct": "✅ Right! The class average represents the market index.",
+                "incorrect": "❌ In the analogy, the class average represents the market index.",
+            },
+            {
+                "key": "index_q3",
+                "prompt": "Which of these are actual market indices?",
+                "widget": "multiselect",
+                "options": ["S&P 500", "Nifty 50", "NASDAQ", "Sensex", "Apple Index", "Facebook 100"],
+                "answer": ["S&P 500", "Nifty 50", "NASDAQ", "Sensex"],
+                "correct": "✅ Perfect! You identified all real market indices.",
+                "incorrect": "❌ S&P 500, Nifty 50, NASDAQ, and Sensex are real indices. Apple Index and Facebook 100 don't exist!",
+            },
+            {
+                "key": "index_q4",
+                "prompt": "How can regular investors buy an entire index?",
+                "widget": "radio",
+                "options": ["Buy each stock individually", "Through ETFs (Exchange-Traded Funds)", "Contact the stock exchange directly", "It's not possible"],
+                "answer": "Through ETFs (Exchange-Traded Funds)",
+                "correct": "✅ Excellent! ETFs allow you to buy entire indices easily.",
+                "incorrect": "❌ ETFs (Exchange-Traded Funds) are the best way to invest in entire indices.",
+            },
+        ],
+        "results": [
+            {"min_score": 4, "level": "success", "message": "🎉 Outstanding! You've mastered market indices!", "complete": True},
+            {"min_score": 3, "level": "info", "message": "Great job! You have a solid understanding of indices."},
+            {"min_score": 0, "level": "warning", "message": "Keep studying! Understanding indices is crucial for investing."},
+        ],
+    },
+}
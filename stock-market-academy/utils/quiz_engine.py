@@ -0,0 +1,133 @@
+"""Render and grade the lesson quizzes defined in `utils.quiz_data`.
+
+Quizzes are compiled once, at import, into answer-key matrices with one row
+per question and one column per option. Grading builds the learner's
+selections as a matching boolean matrix and scores every question with a
+few array operations.
+"""
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+
+from utils.quiz_data import QUIZZES
+
+Question = namedtuple(
+    "Question", ["key", "prompt", "review", "widget", "options", "index", "correct", "incorrect", "distractor"]
+)
+Quiz = namedtuple(
+    "Quiz",
+    ["module", "form", "title", "intro", "submit", "show_score", "questions",
+     "answer_key", "per_option", "points", "total", "results"],
+)
+Result = namedtuple("Result", ["min_score", "level", "message", "complete"])
+Grade = namedtuple("Grade", ["score", "total", "selected", "correct", "picked_wrong", "missed", "result"])
+
+_LEVELS = {"success": st.success, "info": st.info, "warning": st.warning}
+
+
+def compile_quiz(module, spec):
+    questions = []
+    width = max(len(q["options"]) for q in spec["questions"])
+    answer_key = np.zeros((len(spec["questions"]), width), dtype=bool)
+    per_option = np.zeros(len(spec["questions"]), dtype=bool)
+    for row, q in enumerate(spec["questions"]):
+        index = {option: column for column, option in enumerate(q["options"])}
+        answers = [q["answer"]] if q["widget"] == "radio" else q["answer"]
+        answer_key[row, [index[answer] for answer in answers]] = True
+        per_option[row] = q.get("scoring", "exact") == "per_option"
+        questions.append(Question(
+            q["key"], q["prompt"], q.get("review", q["prompt"]), q["widget"], tuple(q["options"]),
+            index, q.get("correct"), q.get("incorrect"), q.get("distractor"),
+        ))
+    # A per-option question is worth one point per correct option
+    points = np.where(per_option, answer_key.sum(axis=1), 1)
+    results = sorted(
+        (Result(r["min_score"], r["level"], r["message"], r.get("complete", False))
+         for r in spec["results"]),
+        key=lambda result: -result.min_score,
+    )
+    return Quiz(
+        module, spec["form"], spec["title"], spec.get("intro"), spec["submit"],
+        spec.get("show_score", True), tuple(questions), answer_key, per_option, points,
+        int(points.sum()), tuple(results),
+    )
+
+
+QUIZ_BANK = {module: compile_quiz(module, spec) for module, spec in QUIZZES.items()}
+
+
+def selection(question, response, width):
+    """A response (an option, or a list of options) as a boolean option row."""
+    chosen = [response] if question.widget == "radio" else response
+    row = np.zeros(width, dtype=bool)
+    row[[question.index[option] for option in chosen]] = True
+    return row
+
+
+def grade(quiz, responses):
+    """Score one response per question."""
+    width = quiz.answer_key.shape[1]
+    selected = np.array([
+        selection(question, response, width)
+        for question, response in zip(quiz.questions, responses)
+    ])
+
+    correct = (selected == quiz.answer_key).all(axis=1)
+    picked_wrong = (selected & ~quiz.answer_key).any(axis=1)
+    earned = np.where(quiz.per_option, (selected & quiz.answer_key).sum(axis=1), correct)
+    score = int(earned.sum())
+    result = next((r for r in quiz.results if score >= r.min_score), None)
+    # A per-option question is only missed below its share of the score that completes the lesson
+    complete_at = min((r.min_score for r in quiz.results if r.complete), default=quiz.total)
+    missed = np.where(quiz.per_option, earned * quiz.total < quiz.points * complete_at, ~correct)
+    return Grade(score, quiz.total, selected, correct, picked_wrong, missed, result)
+
+
+def ask(question, key=None):
+    """Show a question's input widget and return the learner's response."""
+    key = key or question.key
+    if question.widget == "radio":
+        return st.radio(question.prompt, question.options, key=key)
+    return st.multiselect(question.prompt, question.options, key=key)
+
+
+def _give_feedback(quiz, graded):
+    for row, question in enumerate(quiz.questions):
+        if quiz.per_option[row]:
+            if graded.picked_wrong[row] and question.distractor:
+                st.error(question.distractor)
+        elif graded.correct[row]:
+            st.success(question.correct)
+        else:
+            st.error(question.incorrect)
+
+
+def render_quiz(module):
+    """Show the quiz for a registry module and grade it when submitted."""
+    quiz = QUIZ_BANK[module.key]
+    st.markdown(f"## {quiz.title}")
+
+    with st.form(quiz.form):
+        if quiz.intro:
+            st.markdown(quiz.intro)
+        responses = [ask(question) for question in quiz.questions]
+        submitted = st.form_submit_button(quiz.submit)
+
+        if submitted:
+            graded = grade(quiz, responses)
+            _give_feedback(quiz, graded)
+            if quiz.show_score:
+                st.info(f"Your Score: {graded.score}/{graded.total}")
+
+            tracker = st.session_state.progress_tracker
+            missed = [q.review for q, miss in zip(quiz.questions, graded.missed) if miss]
+            chosen = {q.key: np.flatnonzero(row).tolist() for q, row in zip(quiz.questions, graded.selected)}
+            tracker.record_quiz_attempt(module.key, graded.score, graded.total, missed, chosen)
+
+            result = graded.result
+            if result is not None:
+                if result.complete:
+                    st.balloons()
+                    tracker.mark_completed(module.key)
+                _LEVELS[result.level](result.message.format(score=graded.score))
@@ -0,0 +1,46 @@
+from collections import namedtuple
+
+# One learning module. `title` is the page label used by bookmarks and search
+# results; `position` is the module's bit in a ProgressTracker completion mask.
+Module = namedtuple(
+    "Module",
+    ["key", "title", "icon", "path", "order", "position", "prerequisites"],
+)
+
+_MODULE_SPECS = [
+    # (order, icon, title, file stem)
+    (1, "📈", "What is a Stock", "What_is_a_Stock"),
+    (2, "🏢", "Why Companies Go Public", "Why_Companies_Go_Public"),
+    (3, "🛒", "Where to Buy Stocks", "Where_to_Buy_Stocks"),
+    (4, "📊", "Stock Exchanges", "Stock_Exchanges"),
+    (5, "💰", "Stock Pricing", "Stock_Pricing"),
+    (6, "☕", "Market Analogies", "Market_Analogies"),
+    (7, "📋", "Market Indices", "Market_Indices"),
+]
+
+
+def _build_modules():
+    modules = []
+    for position, (order, icon, title, stem) in enumerate(_MODULE_SPECS):
+        key = f"{order}_{icon}_{stem}"
+        # Each module builds on the one before it
+        prerequisites = (modules[-1].key,) if modules else ()
+        modules.append(Module(key, title, icon, f"pages/{key}.py", order, position, prerequisites))
+    return tuple(modules)
+
+
+MODULES = _build_modules()
+MODULE_COUNT = len(MODULES)
+BY_KEY = {module.key: module for module in MODULES}
+BY_TITLE = {module.title: module for module in MODULES}
+
+
+def get_module(key):
+    return BY_KEY[key]
+
+
+def page_path(title):
+    """File path of the lesson page with this label, or None."""
+    module = BY_TITLE.get(title)
+    return module.path if module else None
+
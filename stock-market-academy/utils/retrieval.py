@@ -0,0 +1,63 @@
+"""Find the lesson sections most relevant to a question.
+
+The index is built locally from the lesson pages' own text (see
+`utils.content_data.get_lesson_sections`), so retrieval needs no network or
+model. Each section becomes a column of BM25 term weights, with its
+heading counted twice; a query sums the rows for its terms and takes the
+top k columns, well under a millisecond for the academy's sections.
+"""
+import numpy as np
+import streamlit as st
+
+from utils.answer_cache import normalize_question
+from utils.content_data import get_lesson_sections
+from utils.semantic_cache import FUNCTION_WORDS, stem
+
+TOP_K = 3
+K1 = 1.2
+B = 0.75
+
+
+def index_terms(text):
+    """Normalized, stemmed topic words, as used for both sections and queries."""
+    return [stem(word) for word in normalize_question(text).split() if word not in FUNCTION_WORDS]
+
+
+class LessonIndex:
+    """BM25 over lesson sections, held as a dense terms x sections matrix."""
+
+    def __init__(self, sections):
+        self.sections = list(sections)
+        self.vocabulary = {}
+        rows, columns = [], []
+        for column, section in enumerate(self.sections):
+            for term in index_terms(f"{section['title']} {section['title']} {section['content']}"):
+                rows.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                columns.append(column)
+        counts = np.zeros((len(self.vocabulary), len(self.sections)))
+        np.add.at(counts, (rows, columns), 1)
+
+        lengths = counts.sum(axis=0)
+        document_frequency = np.count_nonzero(counts, axis=1)
+        idf = np.log1p((len(self.sections) - document_frequency + 0.5) / (document_frequency + 0.5))
+        saturation = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+        self.weights = (idf[:, None] * counts * (K1 + 1) / (counts + saturation)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def search(self, query, k=TOP_K):
+        """Up to k sections sharing words with the query, best first."""
+        rows = [self.vocabulary[term] for term in set(index_terms(query)) if term in self.vocabulary]
+        if not rows:
+            return []
+        scores = self.weights[rows].sum(axis=0)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.sections[i] for i in top if scores[i] > 0]
+
+
+@st.cache_resource
+def get_lesson_index():
+    return LessonIndex(get_lesson_sections())
@@ -0,0 +1,191 @@
+"""Spaced-repetition reviews of bookmarks and missed quiz questions.
+
+Scheduling follows SM-2: each item has an easiness factor, an interval and
+a repetition count, updated from a 0-5 recall grade after every review.
+"""
+import heapq
+import time
+from collections import namedtuple
+
+import streamlit as st
+
+from utils.content_data import section_id
+from utils.database import get_database
+from utils.identity import get_user_id
+
+DAY = 24 * 60 * 60
+DEFAULT_EASINESS = 2.5
+MIN_EASINESS = 1.3
+MAX_INTERVAL_DAYS = 365
+# A new bookmark first comes up for review a day after it was saved
+FIRST_REVIEW_DELAY = DAY
+
+# Item kinds
+BOOKMARK = "bookmark"
+QUESTION = "question"
+
+# Buttons shown when reviewing, with their SM-2 grade
+GRADES = {"🔁 Again": 1, "😓 Hard": 3, "🙂 Good": 4, "😎 Easy": 5}
+
+ReviewItem = namedtuple(
+    "ReviewItem", ["id", "kind", "page", "title", "easiness", "interval", "repetitions", "due_at"]
+)
+
+
+def easiness_change(grade):
+    return 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+
+
+def sm2(easiness, interval, repetitions, grade):
+    """Return the (easiness, interval in days, repetitions) after a review."""
+    easiness = max(MIN_EASINESS, easiness + easiness_change(grade))
+    if grade < 3:
+        return easiness, 1, 0
+    repetitions += 1
+    if repetitions == 1:
+        interval = 1
+    elif repetitions == 2:
+        interval = 6
+    else:
+        interval = interval * easiness
+    return easiness, min(interval, MAX_INTERVAL_DAYS), repetitions
+
+
+def question_id(page, prompt):
+    """Review item id of a quiz question, addressed like a content section."""
+    return section_id(page, prompt)
+
+
+# Recorded quiz misses reset the question's schedule and make it due at once
+LAPSE_SQL = (
+    "INSERT INTO reviews (user_id, item_id, kind, page, title, due_at, updated_at) "
+    f"VALUES (?, ?, '{QUESTION}', ?, ?, ?, ?) "
+    "ON CONFLICT (user_id, item_id) DO UPDATE SET "
+    f"easiness = MAX({MIN_EASINESS}, easiness + {easiness_change(1)}), "
+    "interval_days = 0, repetitions = 0, "
+    "due_at = excluded.due_at, updated_at = excluded.updated_at"
+)
+
+
+def lapse_rows(event, page):
+    """LAPSE_SQL parameters for the questions a quiz attempt event missed."""
+    now = time.time()
+    return [
+        (event["user_id"], question_id(page, prompt), page, prompt, event["created_at"], now)
+        for prompt in event["payload"].get("missed", ())
+    ]
+
+
+class ReviewQueue:
+    """One user's review items, ordered by due time in a min-heap.
+
+    A reschedule pushes a fresh heap entry and leaves the old one in place;
+    entries whose due time no longer matches their item are discarded when
+    they reach the top. `sync()` picks up rows changed elsewhere (missed
+    quiz questions) by their update time.
+    """
+
+    def __init__(self, db, user_id):
+        self.db = db
+        self.user_id = user_id
+        self.items = {}
+        self._heap = []
+        self._synced_at = 0.0
+        self._bookmarks_version = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def _push(self, item):
+        if self.items.get(item.id) == item:
+            return  # our own write, read back by sync()
+        self.items[item.id] = item
+        heapq.heappush(self._heap, (item.due_at, item.id))
+        # Rebuild once stale entries outnumber live ones
+        if len(self._heap) > 2 * len(self.items) + 16:
+            self._heap = [(item.due_at, item.id) for item in self.items.values()]
+            heapq.heapify(self._heap)
+
+    def sync(self, bookmarks=None):
+        """Load rows changed since the last sync and follow bookmark changes."""
+        rows = self.db.query(
+            "SELECT item_id, kind, page, title, easiness, interval_days, repetitions, due_at, "
+            "updated_at FROM reviews WHERE user_id = ? AND updated_at > ? ORDER BY updated_at",
+            (self.user_id, self._synced_at),
+        )
+        for row in rows:
+            self._push(ReviewItem(*row[:-1]))
+            self._synced_at = row["updated_at"]
+        if bookmarks is not None and bookmarks.version != self._bookmarks_version:
+            self._sync_bookmarks(bookmarks)
+
+    def _sync_bookmarks(self, bookmarks):
+        saved = set(bookmarks.bookmarks)
+        scheduled = {item.id for item in self.items.values() if item.kind == BOOKMARK}
+        now = time.time()
+        added = [bookmarks.get(bookmark_id) for bookmark_id in saved - scheduled]
+        removed = scheduled - saved
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO reviews (user_id, item_id, kind, page, title, due_at, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(self.user_id, b["id"], BOOKMARK, b["page"], b["title"],
+                  now + FIRST_REVIEW_DELAY, now) for b in added],
+            )
+            conn.executemany(
+                "DELETE FROM reviews WHERE user_id = ? AND item_id = ?",
+                [(self.user_id, bookmark_id) for bookmark_id in removed],
+            )
+        for b in added:
+            self._push(ReviewItem(
+                b["id"], BOOKMARK, b["page"], b["title"], DEFAULT_EASINESS, 0, 0,
+                now + FIRST_REVIEW_DELAY,
+            ))
+        for bookmark_id in removed:
+            del self.items[bookmark_id]
+        self._bookmarks_version = bookmarks.version
+
+    def due(self, now=None, limit=10):
+        """Up to `limit` items due by `now`, most overdue first."""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and len(due) < limit:
+            due_at, item_id = self._heap[0]
+            item = self.items.get(item_id)
+            if item is None or item.due_at != due_at:
+                heapq.heappop(self._heap)
+                continue
+            if due_at > now:
+                break
+            due.append(heapq.heappop(self._heap))
+        for entry in due:
+            heapq.heappush(self._heap, entry)
+        return [self.items[item_id] for _, item_id in due]
+
+    def grade(self, item_id, grade, now=None):
+        """Reschedule an item after a review graded 0-5."""
+        now = time.time() if now is None else now
+        item = self.items[item_id]
+        easiness, interval, repetitions = sm2(item.easiness, item.interval, item.repetitions, grade)
+        item = item._replace(
+            easiness=easiness, interval=interval, repetitions=repetitions,
+            due_at=now + interval * DAY,
+        )
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE reviews SET easiness = ?, interval_days = ?, repetitions = ?, "
+                "reviewed_at = ?, due_at = ?, updated_at = ? WHERE user_id = ? AND item_id = ?",
+                (easiness, interval, repetitions, now, item.due_at, now, self.user_id, item_id),
+            )
+        self._push(item)
+        return item
+
+
+def get_review_queue():
+    """Return the current user's ReviewQueue, creating it on first use."""
+    user_id = get_user_id()
+    queue = st.session_state.get("review_queue")
+    if queue is None or queue.user_id != user_id:
+        queue = ReviewQueue(get_database(), user_id)
+        st.session_state.review_queue = queue
+    return queue
@@ -0,0 +1,107 @@
+import re
+from bisect import bisect_left, insort
+
+def search_content(query, content_data):
+    """Search through all content and return matching results, safely."""
+    results = []
+    query_lower = query.lower()
+    
+    for item in content_data:
+        # Only process items that are dicts
+        if not isinstance(item, dict):
+            continue
+
+        title = item.get('title', '')
+        content = item.get('content', '')
+        keywords = item.get('keywords', [])
+
+        # Ensure title and content are strings, keywords is a list
+        if not isinstance(title, str):
+            title = ''
+        if not isinstance(content, str):
+            content = ''
+        if not isinstance(keywords, list):
+            keywords = []
+
+        # Search in title
+        if query_lower in title.lower():
+            results.append({
+                **item,
+                'match_type': 'title',
+                'relevance': 3
+            })
+        # Search in content
+        elif query_lower in content.lower():
+            results.append({
+                **item,
+                'match_type': 'content', 
+                'relevance': 2
+            })
+        # Search in keywords
+        elif any(isinstance(keyword, str) and query_lower in keyword.lower() for keyword in keywords):
+            results.append({
+                **item,
+                'match_type': 'keyword',
+                'relevance': 1
+            })
+    
+    # Sort by relevance (higher first)
+    results.sort(key=lambda x: x['relevance'], reverse=True)
+    return results
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9&]+")
+
+
+def tokenize(text):
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class TextIndex:
+    """A small inverted index from word to document keys.
+
+    Documents can be added and removed one at a time, and queries match
+    documents containing every query word as a word prefix, so "vol" finds
+    "volatility".
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._terms = []  # sorted, for prefix lookups
+        self._doc_terms = {}
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add(self, key, text):
+        self.remove(key)
+        terms = set(tokenize(text))
+        self._doc_terms[key] = terms
+        for term in terms:
+            keys = self._postings.get(term)
+            if keys is None:
+                keys = self._postings[term] = set()
+                insort(self._terms, term)
+            keys.add(key)
+
+    def remove(self, key):
+        for term in self._doc_terms.pop(key, ()):
+            keys = self._postings[term]
+            keys.discard(key)
+            if not keys:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def search(self, query):
+        """Return the set of keys whose text matches every word of `query`."""
+        matches = None
+        for word in tokenize(query):
+            keys = set()
+            position = bisect_left(self._terms, word)
+            while position < len(self._terms) and self._terms[position].startswith(word):
+                keys |= self._postings[self._terms[position]]
+                position += 1
+            matches = keys if matches is None else matches & keys
+            if not matches:
+                return set()
+        return matches if matches is not None else set()
@@ -0,0 +1,162 @@
+"""Search scaling harness.
+
+Run from the stock-market-academy folder:
+
+    python -m utils.search_benchmark --sizes 1000 10000 100000 --output bench.json
+
+Each backend is built over synthetic corpora of increasing size and timed on
+the same query set, so reports from different runs/backends are comparable.
+Pass --baseline with an earlier report to add a p50 speedup column.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from utils.corpus_generator import generate_corpus, generate_queries
+from utils.search import TextIndex, search_content
+
+
+def build_linear(corpus):
+    """Baseline: no index, every query scans the whole corpus."""
+    return lambda query: search_content(query, corpus)
+
+
+def build_text_index(corpus):
+    """Inverted word-prefix index over title, content and keywords."""
+    index = TextIndex()
+    for position, item in enumerate(corpus):
+        index.add(position, " ".join([item["title"], item["content"], *item["keywords"]]))
+    return lambda query: [corpus[position] for position in index.search(query)]
+
+
+# name -> build(corpus) returning search(query)
+BACKENDS = {
+    "linear": build_linear,
+    "text_index": build_text_index,
+}
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_memory(build, corpus):
+    """Bytes retained by the index and peak bytes allocated while building it."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    index = build(corpus)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+    return retained - before, peak - before
+
+
+def run_backend(name, build, corpus, queries, warmup=5):
+    start = time.perf_counter()
+    search = build(corpus)
+    build_seconds = time.perf_counter() - start
+
+    for query in queries[:warmup]:
+        search(query)
+
+    latencies = []
+    hits = 0
+    for query in queries:
+        start = time.perf_counter()
+        results = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += bool(results)
+    latencies.sort()
+
+    retained, peak = measure_memory(build, corpus)
+    return {
+        "backend": name,
+        "size": len(corpus),
+        "queries": len(queries),
+        "hit_rate": hits / len(queries),
+        "build_ms": build_seconds * 1000,
+        "index_bytes": retained,
+        "build_peak_bytes": peak,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies),
+    }
+
+
+def run(sizes, backends, query_count, seed):
+    queries = generate_queries(query_count, seed=seed)
+    rows = []
+    for size in sizes:
+        corpus = generate_corpus(size, seed=seed)
+        for name in backends:
+            rows.append(run_backend(name, BACKENDS[name], corpus, queries))
+            print(f"  {name:>10} @ {size:>7}: p50 {rows[-1]['p50_ms']:.3f} ms", file=sys.stderr)
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": rows,
+    }
+
+
+def format_report(report, baseline=None):
+    """Render a report as a Markdown table, optionally against a baseline report."""
+    base = {}
+    if baseline:
+        base = {(row["backend"], row["size"]): row for row in baseline["results"]}
+
+    header = "| backend | size | build ms | index KiB | p50 ms | p99 ms | hit rate |"
+    rule = "|---|---:|---:|---:|---:|---:|---:|"
+    if base:
+        header += " p50 vs baseline |"
+        rule += "---:|"
+    lines = [f"Search scaling ({report['generated_at']}, Python {report['python']})", "", header, rule]
+    for row in report["results"]:
+        line = (
+            f"| {row['backend']} | {row['size']} | {row['build_ms']:.1f} | "
+            f"{row['index_bytes'] / 1024:.0f} | {row['p50_ms']:.3f} | "
+            f"{row['p99_ms']:.3f} | {row['hit_rate']:.0%} |"
+        )
+        if base:
+            previous = base.get((row["backend"], row["size"])) or base.get(("linear", row["size"]))
+            if previous and row["p50_ms"]:
+                line += f" {previous['p50_ms'] / row['p50_ms']:.1f}x |"
+            else:
+                line += " - |"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.backends, args.queries, args.seed)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(format_report(report, baseline))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""A second-tier answer cache that matches paraphrased questions.
+
+Questions are embedded on the CPU as signed, hashed bags of their
+normalized and lightly stemmed words, with question and filler words
+weighted down so the topic words dominate. Adjacent topic words are also
+hashed as pairs, so swapping them ("dollars to euros", "euros to dollars")
+lowers the similarity instead of leaving it unchanged. Cached question
+vectors live in a fixed-size ring buffer, and a lookup is one
+matrix-vector product over it: the best match with the same negation
+words is served if its cosine similarity clears `threshold`, so "should I
+not buy" never reuses the answer to "should I buy".
+"""
+import threading
+import time
+import zlib
+
+import numpy as np
+import streamlit as st
+
+from utils.answer_cache import TTL, normalize_question
+
+EMBEDDING_DIM = 512
+CAPACITY = 1024
+THRESHOLD = 0.85
+FUNCTION_WEIGHT = 0.25
+PAIR_WEIGHT = 0.7
+
+FUNCTION_WORDS = {
+    "what", "is", "how", "do", "does", "did", "can", "could", "should", "would", "will",
+    "why", "when", "which", "who", "i", "me", "my", "you", "it", "its", "this", "that",
+    "to", "of", "in", "on", "for", "with", "about", "and", "if", "be", "are", "there",
+    "work", "mean", "way", "ways", "any", "some",
+}
+# A question only matches one with the same of these; "t" is what tokenizing leaves of "n't"
+NEGATIONS = {"not", "no", "never", "cannot", "nor", "t"}
+_SUFFIXES = (("ies", "y"), ("ing", ""), ("ment", ""), ("s", ""))
+
+
+def stem(word):
+    """Strip a plural or common suffix, keeping at least three letters."""
+    if word in FUNCTION_WORDS or word.endswith("ss"):
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def negation_words(question):
+    return frozenset(word for word in normalize_question(question).split() if word in NEGATIONS)
+
+
+def embed_question(question, dim=EMBEDDING_DIM):
+    """A unit-length float32 vector for the question (all zeros if it has no words)."""
+    words = [stem(word) for word in normalize_question(question).split()]
+    if not words:
+        return np.zeros(dim, dtype=np.float32)
+    topics = [word for word in words if word not in FUNCTION_WORDS]
+    features = words + [f"{a} {b}" for a, b in zip(topics, topics[1:])]
+    hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in features], dtype=np.uint64)
+    weights = np.concatenate([
+        np.where([word in FUNCTION_WORDS for word in words], FUNCTION_WEIGHT, 1.0),
+        np.full(len(features) - len(words), PAIR_WEIGHT),
+    ])
+    # The hash's top bit picks the sign, so colliding words tend to cancel
+    signs = np.where(hashes >> np.uint64(31), -1.0, 1.0)
+    vector = np.bincount((hashes % np.uint64(dim)).astype(np.intp), weights=weights * signs, minlength=dim)
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).astype(np.float32)
+
+
+class SemanticCache:
+    """Answers for recent question vectors in a ring buffer, matched by cosine.
+
+    A stored question only matches a lookup with the same `negation_words`.
+
+    The oldest entry is overwritten once `capacity` are stored. Entries
+    expire after `ttl`, and all of them are dropped when the model version
+    changes.
+    """
+
+    def __init__(self, capacity=CAPACITY, threshold=THRESHOLD, ttl=TTL, dim=EMBEDDING_DIM,
+                 clock=time.monotonic):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.clock = clock
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._expires = np.full(capacity, -np.inf)
+        self._answers = [None] * capacity
+        self._negations = [None] * capacity
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return int(np.count_nonzero(self._expires > self.clock()))
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, vector, negations, version, default=None):
+        """The answer for the most similar live question above the threshold."""
+        with self._lock:
+            self._check_version(version)
+            scores = self._vectors @ vector
+            scores[self._expires <= self.clock()] = -np.inf
+            candidates = np.flatnonzero(scores >= self.threshold)
+            for slot in candidates[np.argsort(-scores[candidates])]:
+                if self._negations[slot] == negations:
+                    self.hits += 1
+                    return self._answers[slot]
+            self.misses += 1
+            return default
+
+    def put(self, vector, negations, answer, version):
+        with self._lock:
+            self._check_version(version)
+            slot = self._next
+            self._vectors[slot] = vector
+            self._expires[slot] = self.clock() + self.ttl
+            self._answers[slot] = answer
+            self._negations[slot] = negations
+            self._next = (slot + 1) % len(self._answers)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": int(np.count_nonzero(self._expires > self.clock())),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "invalidations": self.invalidations,
+            }
+
+    def _check_version(self, version):
+        if version != self.version:
+            if np.isfinite(self._expires).any():
+                self._expires[:] = -np.inf
+                self._answers = [None] * len(self._answers)
+                self._negations = [None] * len(self._negations)
+                self.invalidations += 1
+            self.version = version
+
+
+@st.cache_resource
+def get_semantic_cache():
+    return SemanticCache()